@@ -1,18 +1,64 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
+import logging
+import queue
 import os
 
 from app.routers import validation, chat, prescreening
+from app.services.http_client import close_http_client
+from app.services.blacklist_service import get_blacklist_service
+from app.services.chat_service import load_token_encoding
 
 # Load environment variables
 load_dotenv()
 
+# Logging: handlers only enqueue records, and a background listener thread
+# does the formatting and stdout writes, keeping them off the event loop.
+# Set LOG_LEVEL=DEBUG to see verbose service output.
+log_queue: queue.Queue = queue.Queue(-1)
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+queue_listener = QueueListener(log_queue, log_handler)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[queue_handler],
+)
+# httpx logs every request URL at INFO, which would write API keys passed as
+# query parameters (e.g. the Google Maps key) and applicant addresses to the logs
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("httpcore").setLevel(logging.WARNING)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services on startup and stop them on shutdown"""
+    queue_listener.start()
+    # Load the blacklist before serving, so the first validation doesn't wait on it
+    await get_blacklist_service().refresh_cache_if_needed()
+    # Load the chat model's token encoding (a blocking download) in a thread
+    await load_token_encoding()
+    yield
+    # Close pooled outbound connections (shared by every service) before exiting
+    await close_http_client()
+    queue_listener.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ChatForm API",
     description="AI-powered form validation system",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson serializes the nested red flag / chat payloads much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
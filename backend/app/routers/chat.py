@@ -3,14 +3,19 @@ Chat router for handling chatbot conversations
 """
 
 from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
+from contextlib import aclosing
 import logging
 
 from app.schemas.application import (
     ChatMessageRequest,
     ChatMessageResponse,
+    ChatInitRequest,
+    ChatInitResponse,
 )
-from app.services.chat_service import ChatService
+from app.services.chat_service import get_chat_service
+from app.routers.sse import sse_response
+from app.routers.responses import ModelResponse
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -18,6 +23,39 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _error_response(error: Exception, timestamp: datetime) -> ChatMessageResponse:
+    """
+    Log a failed chat request and build the error reply shown to the user
+
+    Args:
+        error: Exception raised while getting the AI response
+        timestamp: Response timestamp
+
+    Returns:
+        Chat message response with error status
+    """
+    if isinstance(error, ValueError):
+        # Handle validation errors
+        logger.error(f"Validation error in chat: {error}")
+        return ChatMessageResponse.model_construct(
+            role="assistant",
+            content="I'm sorry, but I encountered an issue processing your request. Please try again.",
+            timestamp=timestamp,
+            status="error",
+            error=str(error),
+        )
+
+    # Handle unexpected errors
+    logger.error(f"Unexpected error in chat: {error}", exc_info=error)
+    return ChatMessageResponse.model_construct(
+        role="assistant",
+        content="I'm sorry, but something went wrong. Please try again later.",
+        timestamp=timestamp,
+        status="error",
+        error="Internal server error",
+    )
+
+
 @router.post("/chat/message", response_model=ChatMessageResponse)
 async def send_chat_message(request: ChatMessageRequest):
     """
@@ -32,9 +70,12 @@ async def send_chat_message(request: ChatMessageRequest):
     Raises:
         HTTPException: If chat service fails
     """
+    # One timestamp shared by whichever response this handler returns
+    timestamp = datetime.now(timezone.utc)
+
     try:
-        # Initialize chat service
-        service = ChatService()
+        # Get shared chat service
+        service = get_chat_service()
 
         # Send message and get response
         response_content = await service.send_message(
@@ -44,32 +85,83 @@ async def send_chat_message(request: ChatMessageRequest):
             conversation_history=request.conversationHistory,
         )
 
-        # Return successful response
-        return ChatMessageResponse(
+        # Return successful response (fields are server-built, skip validation)
+        return ModelResponse(ChatMessageResponse.model_construct(
             role="assistant",
             content=response_content,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             status="success",
+        ))
+
+    except Exception as e:
+        return ModelResponse(_error_response(e, timestamp))
+
+
+@router.post("/chat/message/stream")
+async def stream_chat_message(request: ChatMessageRequest):
+    """
+    Handle chat message and stream the AI response as Server-Sent Events
+
+    Each event carries a content delta (`data: {"content": "..."}`) and the
+    stream ends with `data: [DONE]`. Use `/chat/message` when the full
+    response object is needed.
+
+    Args:
+        request: Chat message request with user message, red flag, and context
+
+    Returns:
+        Streaming response with `text/event-stream` media type
+    """
+    async def deltas():
+        service = get_chat_service()
+
+        stream = service.send_message_stream(
+            user_message=request.message,
+            red_flag=request.redFlag,
+            app_data=request.applicationData,
+            conversation_history=request.conversationHistory,
         )
+        async with aclosing(stream):
+            async for delta in stream:
+                yield delta
+
+    return sse_response(deltas())
+
+
+@router.post("/chat/init", response_model=ChatInitResponse)
+async def init_chats(request: ChatInitRequest):
+    """
+    Start the conversations for several red flags at once
+
+    The opening messages are generated concurrently, so the latency is the
+    slowest flag rather than the sum of all of them.
+
+    Args:
+        request: Red flags to open conversations for, and application context
+
+    Returns:
+        Opening assistant message per red flag, in request order (a flag
+        that failed gets an error-status message; the others are unaffected)
+    """
+    timestamp = datetime.now(timezone.utc)
+
+    try:
+        service = get_chat_service()
+        results = await service.init_all(request.redFlags, request.applicationData)
 
     except ValueError as e:
-        # Handle validation errors
-        logger.error(f"Validation error in chat: {e}")
-        return ChatMessageResponse(
-            role="assistant",
-            content="I'm sorry, but I encountered an issue processing your request. Please try again.",
-            timestamp=datetime.utcnow(),
-            status="error",
-            error=str(e),
-        )
+        results = [e] * len(request.redFlags)
 
-    except Exception as e:
-        # Handle unexpected errors
-        logger.error(f"Unexpected error in chat: {e}", exc_info=True)
-        return ChatMessageResponse(
+    messages = [
+        _error_response(result, timestamp)
+        if isinstance(result, Exception)
+        else ChatMessageResponse.model_construct(
             role="assistant",
-            content="I'm sorry, but something went wrong. Please try again later.",
-            timestamp=datetime.utcnow(),
-            status="error",
-            error="Internal server error",
+            content=result,
+            timestamp=timestamp,
+            status="success",
         )
+        for result in results
+    ]
+
+    return ModelResponse(ChatInitResponse.model_construct(messages=messages))
@@ -3,24 +3,53 @@ Pre-screening chat router for gathering political exposure information
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional, Literal, List
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Literal, List
+from datetime import datetime, timezone
+from contextlib import aclosing
+import logging
+
+from app.schemas.application import (
+    ChatMessage,
+    MAX_CONVERSATION_MESSAGES,
+    MAX_MESSAGE_LENGTH,
+)
+from app.routers.sse import sse_response
+from app.routers.responses import ModelResponse
+from app.services.chat_service import get_chat_service
+
+# Set up logging
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# System prompt focused on gathering information for review agent
+PRESCREENING_SYSTEM_PROMPT = """You are a helpful assistant gathering information for a pre-screening questionnaire.
 
-class ChatMessage(BaseModel):
-    """Chat message model"""
-    role: Literal["user", "assistant"]
-    content: str
-    timestamp: Optional[datetime] = None
+The applicant has indicated they may fall into one of two categories:
+1. They are a US citizen, OR
+2. They or an immediate family member holds a political or government position.
+
+Your job is to:
+- Determine whether either category applies.
+- If neither applies, confirm that and conclude. Ask clear, specific follow-up questions to gather relevant details for the AI review agent
+- Understand their specific situation 
+- Do NOT ask about relatives unless the applicant mentions them.
+- Be professional, concise, and friendly
+- When you have gathered sufficient information, thank the customer and acknowledge you have received enough details
+- If unsure restate what you know and ask them to confirm
+Keep responses brief and focused. The information you collect will be passed to a review agent."""
+
+# Shared system message - treat as immutable, it is reused across requests
+_SYSTEM_MSG = {"role": "system", "content": PRESCREENING_SYSTEM_PROMPT}
 
 
 class PreScreeningChatRequest(BaseModel):
     """Request for pre-screening chat"""
-    message: str
-    conversationHistory: List[ChatMessage] = []
+    message: str = Field(max_length=MAX_MESSAGE_LENGTH)
+    conversationHistory: List[ChatMessage] = Field(
+        default_factory=list, max_length=MAX_CONVERSATION_MESSAGES
+    )
 
 
 class PreScreeningChatResponse(BaseModel):
@@ -30,6 +59,27 @@ class PreScreeningChatResponse(BaseModel):
     timestamp: datetime
 
 
+def build_prescreening_messages(request: PreScreeningChatRequest) -> List[dict]:
+    """Build the OpenAI messages array for a pre-screening conversation"""
+    # Build message array for OpenAI
+    messages = [_SYSTEM_MSG]
+
+    # Add conversation history
+    for msg in request.conversationHistory:
+        messages.append({
+            "role": msg.role,
+            "content": msg.content
+        })
+
+    # Add current user message
+    messages.append({
+        "role": "user",
+        "content": request.message
+    })
+
+    return messages
+
+
 @router.post("/prescreening/chat", response_model=PreScreeningChatResponse)
 async def prescreening_chat(request: PreScreeningChatRequest):
     """
@@ -37,57 +87,43 @@ async def prescreening_chat(request: PreScreeningChatRequest):
 
     This endpoint gathers information about political exposure for AI review
     """
-    try:
-        from app.services.chat_service import ChatService
-
-        chat_service = ChatService()
-
-        # System prompt focused on gathering information for review agent
-        system_prompt = """You are a helpful assistant gathering information for a pre-screening questionnaire.
-
-The applicant has indicated they may fall into one of two categories:
-1. They are a US citizen, OR
-2. They or an immediate family member holds a political or government position.
-
-Your job is to:
-- Determine whether either category applies.
-- If neither applies, confirm that and conclude. Ask clear, specific follow-up questions to gather relevant details for the AI review agent
-- Understand their specific situation 
-- Do NOT ask about relatives unless the applicant mentions them.
-- Be professional, concise, and friendly
-- When you have gathered sufficient information, thank the customer and acknowledge you have received enough details
-- If unsure restate what you know and ask them to confirm
-Keep responses brief and focused. The information you collect will be passed to a review agent."""
+    timestamp = datetime.now(timezone.utc)
 
+    try:
+        chat_service = get_chat_service()
 
-        # Build message array for OpenAI
-        messages = [{"role": "system", "content": system_prompt}]
-
-        # Add conversation history
-        for msg in request.conversationHistory:
-            messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-
-        # Add current user message
-        messages.append({
-            "role": "user",
-            "content": request.message
-        })
+        messages = build_prescreening_messages(request)
 
         # Get response from ChatService
         response_content = await chat_service.get_completion(messages)
 
-        return PreScreeningChatResponse(
+        return ModelResponse(PreScreeningChatResponse.model_construct(
             role="assistant",
             content=response_content,
-            timestamp=datetime.now()
-        )
+            timestamp=timestamp
+        ))
 
     except Exception as e:
-        print(f"Error in prescreening chat: {e}")
+        logger.error(f"Error in prescreening chat: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process chat message: {str(e)}"
         )
+
+
+@router.post("/prescreening/chat/stream")
+async def prescreening_chat_stream(request: PreScreeningChatRequest):
+    """
+    Handle pre-screening chat conversation, streaming the response as
+    Server-Sent Events (`data: {"content": "..."}` ... `data: [DONE]`)
+    """
+    async def deltas():
+        chat_service = get_chat_service()
+
+        messages = build_prescreening_messages(request)
+
+        async with aclosing(chat_service.get_completion_stream(messages)) as stream:
+            async for delta in stream:
+                yield delta
+
+    return sse_response(deltas())
@@ -0,0 +1,22 @@
+"""
+Response helpers for returning server-built Pydantic models
+"""
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    JSON response that serializes a Pydantic model directly
+
+    Returning a Response from a route skips FastAPI's response_model
+    re-validation, so models the server built itself (e.g. with
+    model_construct) are serialized once by pydantic-core and nothing else.
+    Keep `response_model=` on the route so the OpenAPI schema is unchanged.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
@@ -0,0 +1,69 @@
+"""
+Server-Sent Events helpers for streaming chat responses
+"""
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from contextlib import aclosing
+from typing import AsyncIterator
+import logging
+import orjson
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Disable client caching and reverse-proxy buffering (e.g. nginx) so each
+# delta reaches the browser as soon as it is produced
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(data: dict) -> str:
+    """Format a payload as a single SSE `data:` event"""
+    return f"data: {orjson.dumps(data).decode()}\n\n"
+
+
+async def _event_stream(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Wrap content deltas as SSE events
+
+    Errors raised mid-stream are reported as an `error` event, since the
+    HTTP status has already been sent by the time they occur. The stream is
+    always terminated with `data: [DONE]`, matching OpenAI's protocol.
+    """
+    try:
+        async with aclosing(deltas):
+            async for delta in deltas:
+                yield format_event({"content": delta})
+
+    except Exception as e:
+        logger.error(f"Error while streaming chat response: {e}", exc_info=True)
+        yield format_event({"error": "Failed to process chat message"})
+
+    yield "data: [DONE]\n\n"
+
+
+def sse_response(deltas: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Build a streaming response that forwards content deltas as SSE
+
+    Args:
+        deltas: Async iterator of assistant content fragments
+
+    Returns:
+        StreamingResponse with `text/event-stream` media type
+    """
+    events = _event_stream(deltas)
+
+    # Starlette stops iterating on client disconnect but never closes the
+    # iterator; closing it here (also after a normal finish, when it is a
+    # no-op) unwinds the generators beneath it, which release their OpenAI
+    # stream and concurrency slot instead of holding them until GC
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(events.aclose),
+    )
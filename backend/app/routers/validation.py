@@ -1,22 +1,26 @@
 from fastapi import APIRouter
 from app.schemas.application import ApplicationData, ValidationResponse
-from app.services.rule_engine import RuleEngine
+from app.services.rule_engine import get_rule_engine
+from app.routers.responses import ModelResponse
 
 router = APIRouter()
 
 
 @router.post("/validate", response_model=ValidationResponse)
-async def validate_application(data: ApplicationData):
+async def validate_application(data: ApplicationData, fail_fast: bool = False):
     """
     Validate application data and return red flags
 
     Args:
         data: Application form data
+        fail_fast: Query flag; stop at red flags from the in-memory rules
+            instead of also running the external-service checks
 
     Returns:
         ValidationResponse with list of red flags
     """
-    rule_engine = RuleEngine()
-    red_flags = await rule_engine.validate(data)
+    rule_engine = get_rule_engine()
+    red_flags = await rule_engine.validate(data, fail_fast=fail_fast)
 
-    return ValidationResponse(red_flags=red_flags)
+    # Red flags are already validated RedFlag instances
+    return ModelResponse(ValidationResponse.model_construct(red_flags=red_flags))
@@ -1,17 +1,27 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal, List
 from datetime import datetime
+from functools import cached_property
+
+# Request size limits, enforced by the parser before any downstream work
+MAX_CONVERSATION_MESSAGES = 64
+MAX_MESSAGE_LENGTH = 8000
+MAX_INIT_RED_FLAGS = 16
 
 
 class PreScreeningData(BaseModel):
     """Pre-screening data structure"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     response: Literal["yes", "no"]
     explanation: str
-    chatHistory: List[dict]  # List of ChatMessage dicts
+    chatHistory: List[dict] = Field(max_length=MAX_CONVERSATION_MESSAGES)  # List of ChatMessage dicts
 
 
 class ApplicationData(BaseModel):
-    """Application form data"""
+    """Application form data (immutable once parsed)"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     firstName: Optional[str] = None
     lastName: Optional[str] = None
     currentAddress: Optional[str] = None
@@ -36,6 +46,11 @@ class RedFlag(BaseModel):
     affectedFields: list[str]
     debugInfo: Optional[dict] = None  # Additional debug information
 
+    @cached_property
+    def affected_fields_text(self) -> str:
+        """Affected fields joined for display (computed once per red flag)"""
+        return ", ".join(self.affectedFields)
+
 
 class ValidationResponse(BaseModel):
     """Response from validation endpoint"""
@@ -46,16 +61,18 @@ class ValidationResponse(BaseModel):
 class ChatMessage(BaseModel):
     """Single chat message"""
     role: Literal["user", "assistant"]
-    content: str
+    content: str = Field(max_length=MAX_MESSAGE_LENGTH)
     timestamp: Optional[datetime] = None
 
 
 class ChatMessageRequest(BaseModel):
     """Request to send chat message"""
-    message: str
+    message: str = Field(max_length=MAX_MESSAGE_LENGTH)
     redFlag: RedFlag
     applicationData: ApplicationData
-    conversationHistory: list[ChatMessage] = []
+    conversationHistory: list[ChatMessage] = Field(
+        default_factory=list, max_length=MAX_CONVERSATION_MESSAGES
+    )
 
 
 class ChatMessageResponse(BaseModel):
@@ -65,3 +82,14 @@ class ChatMessageResponse(BaseModel):
     timestamp: datetime
     status: Literal["success", "error"]
     error: Optional[str] = None
+
+
+class ChatInitRequest(BaseModel):
+    """Request to open the conversations for several red flags at once"""
+    redFlags: list[RedFlag] = Field(min_length=1, max_length=MAX_INIT_RED_FLAGS)
+    applicationData: ApplicationData
+
+
+class ChatInitResponse(BaseModel):
+    """Opening assistant messages, one per requested red flag (same order)"""
+    messages: list[ChatMessageResponse]
@@ -1,70 +1,133 @@
-import httpx
 import csv
-from typing import Set, Tuple, Optional
-from datetime import datetime, timedelta
-import io
+import asyncio
+import logging
+import time
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
+from app.services.http_client import get_http_client
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _name_key(first_name: str, last_name: str) -> str:
+    """
+    Build the lookup key for a name
+
+    Names are NFKD-normalized (so composed and decomposed or full-width
+    spellings compare equal), case-folded (Unicode-aware, unlike lower())
+    and joined with a unit separator, so a lookup hashes one string
+    instead of a tuple.
+    """
+    key = f"{first_name.strip()}\x1f{last_name.strip()}"
+    return unicodedata.normalize("NFKD", key).casefold()
+
+
+def _parse_csv_line(line: str) -> List[str]:
+    """Parse a single CSV line into its fields (empty list for blank lines)"""
+    return next(csv.reader([line]), [])
 
 
 class BlacklistService:
     """Service to fetch and check names against Google Sheets blacklist"""
 
     def __init__(self):
-        self.blacklist: Set[Tuple[str, str]] = set()
-        self.last_fetch: Optional[datetime] = None
-        self.cache_duration = timedelta(hours=1)
+        self._blacklist_keys: FrozenSet[str] = frozenset()
+        self.last_fetch: Optional[float] = None  # time.monotonic() of last successful fetch
+        self.cache_duration = 3600.0  # seconds
         self.sheet_url = "https://docs.google.com/spreadsheets/d/1fMGqPIbihu_Lr2YpgeIGhl1ypTBP7_hitBebu-yiKls/export?format=csv"
 
-    async def fetch_blacklist(self) -> Set[Tuple[str, str]]:
+        # Serializes refreshes so concurrent requests trigger a single fetch
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def fetch_blacklist(self) -> Optional[FrozenSet[str]]:
         """
         Fetch blacklist from Google Sheets CSV export.
 
         Returns:
-            Set of (first_name, last_name) tuples in lowercase
+            Frozenset of name keys (see _name_key), or None if the fetch failed
         """
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(self.sheet_url, timeout=10.0)
+            async with get_http_client().stream(
+                "GET", self.sheet_url, timeout=10.0, follow_redirects=True
+            ) as response:
                 response.raise_for_status()
 
-                # Parse CSV content
-                csv_content = response.text
-                print(f"CSV Content:\n{csv_content}")
-                csv_reader = csv.DictReader(io.StringIO(csv_content))
+                # Parse CSV rows as lines arrive instead of buffering the body
+                lines = response.aiter_lines()
+
+                # Resolve column positions once from the header; strip handles
+                # "First_name " with trailing space
+                header = [h.strip().lower() for h in _parse_csv_line(await anext(lines))]
+                fn_idx = header.index("first_name")
+                ln_idx = header.index("last_name")
+                min_len = max(fn_idx, ln_idx) + 1
 
                 blacklist = set()
-                for row in csv_reader:
-                    print(f"CSV Row: {row}")
-                    # Strip whitespace from keys to handle "First_name " with trailing space
-                    row_cleaned = {k.strip(): v for k, v in row.items()}
-                    first_name = row_cleaned.get("First_name", "").strip().lower()
-                    last_name = row_cleaned.get("Last_name", "").strip().lower()
+                async for line in lines:
+                    row = _parse_csv_line(line)
+                    if len(row) < min_len:
+                        continue
+
+                    first_name = row[fn_idx].strip()
+                    last_name = row[ln_idx].strip()
 
                     # Only add if both names are present
                     if first_name and last_name:
-                        blacklist.add((first_name, last_name))
+                        blacklist.add(_name_key(first_name, last_name))
 
-                print(f"✓ Blacklist fetched successfully: {len(blacklist)} entries")
-                print(f"  Blacklist contents: {blacklist}")
-                return blacklist
+            logger.info(f"Blacklist fetched successfully: {len(blacklist)} entries")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Blacklist contents: {blacklist}")
+            return frozenset(blacklist)
 
         except Exception as e:
-            # Log error and return empty set (fail open)
-            print(f"Error fetching blacklist: {e}")
-            return set()
+            # Log error; callers keep serving the previous blacklist
+            logger.error(f"Error fetching blacklist: {e}")
+            return None
+
+    def _is_stale(self) -> bool:
+        """Check if the cached blacklist has expired or was never loaded"""
+        return (self.last_fetch is None or
+                time.monotonic() - self.last_fetch > self.cache_duration)
+
+    async def _refresh(self) -> None:
+        """
+        Fetch the blacklist and swap it in.
+
+        Failed fetches keep the current blacklist (empty on cold start, i.e.
+        fail open) and leave it marked stale so the next call retries.
+        """
+        async with self._refresh_lock:
+            # Another coroutine may have refreshed while we waited for the lock
+            if not self._is_stale():
+                return
+
+            blacklist = await self.fetch_blacklist()
+            if blacklist is not None:
+                self._blacklist_keys = blacklist
+                self.last_fetch = time.monotonic()
 
     async def refresh_cache_if_needed(self) -> None:
         """
-        Refresh cache if it's expired or empty.
+        Refresh cache if it's expired or has never been loaded.
+
+        The first load is awaited. After that, a stale blacklist keeps being
+        served while a single background task refreshes it
+        (stale-while-revalidate), so no request waits on Google Sheets.
         """
-        now = datetime.now()
+        if not self._is_stale():
+            return
 
-        # Check if cache needs refresh
-        if (not self.blacklist or
-            self.last_fetch is None or
-            now - self.last_fetch > self.cache_duration):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
 
-            self.blacklist = await self.fetch_blacklist()
-            self.last_fetch = now
+        # The first load is awaited through a shield, so a caller that times
+        # out or is cancelled doesn't abort the fetch for everyone else
+        if self.last_fetch is None:
+            await asyncio.shield(self._refresh_task)
 
     async def is_blacklisted(self, first_name: str, last_name: str) -> bool:
         """
@@ -80,11 +143,11 @@ class BlacklistService:
         # Refresh cache if needed
         await self.refresh_cache_if_needed()
 
-        # Normalize names to lowercase for case-insensitive matching
-        first_name_lower = first_name.strip().lower()
-        last_name_lower = last_name.strip().lower()
+        # Keys are case-folded for case-insensitive matching
+        return _name_key(first_name, last_name) in self._blacklist_keys
+
 
-        # Check if name is in blacklist
-        is_match = (first_name_lower, last_name_lower) in self.blacklist
-        print(f"Checking name: ('{first_name_lower}', '{last_name_lower}') -> {'BLACKLISTED' if is_match else 'OK'}")
-        return is_match
+@lru_cache(maxsize=1)
+def get_blacklist_service() -> BlacklistService:
+    """Return the shared BlacklistService, so its cache survives across requests"""
+    return BlacklistService()
@@ -0,0 +1,114 @@
+"""
+In-process caching helpers shared by the services
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a time-to-live
+
+    Concurrent misses for the same key are coalesced by `get_or_fetch`, so
+    only one fetch is in flight per key (thundering-herd protection).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value under key, evicting the least recently used entries
+
+        Args:
+            key: Hashable cache key
+            value: Value to store
+            ttl: Lifetime in seconds for this entry (defaults to the cache ttl)
+        """
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached values"""
+        self._data.clear()
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[Callable[[Any], Optional[float]]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, calling fetch() on a miss
+
+        Callers that miss while a fetch for the same key is already running
+        await that fetch instead of starting their own. Only successful
+        results are cached; exceptions propagate to every waiting caller.
+
+        Args:
+            key: Hashable cache key
+            fetch: Zero-argument coroutine function producing the value
+            ttl: Optional function mapping a fetched value to its lifetime in
+                seconds, or to None to return the value without caching it
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_fetched(key, t, ttl))
+
+        # Shield so a cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _on_fetched(
+        self,
+        key: Hashable,
+        task: asyncio.Future,
+        ttl: Optional[Callable[[Any], Optional[float]]],
+    ) -> None:
+        """Store a completed fetch result and clear its in-flight entry"""
+        self._inflight.pop(key, None)
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        value = task.result()
+        if ttl is None:
+            self.set(key, value)
+        elif (lifetime := ttl(value)) is not None:
+            self.set(key, value, lifetime)
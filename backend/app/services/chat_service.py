@@ -3,75 +3,129 @@ Chat service for handling OpenAI GPT-4o conversations to resolve validation red
 """
 
 import os
-from typing import List, Dict, Any
+import json
+import asyncio
+import logging
+import hashlib
+import string
+import httpx
+import tiktoken
+from contextlib import aclosing
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Tuple
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
 from app.schemas.application import ApplicationData, RedFlag, ChatMessage
 from app.services.tools import ToolRegistry, EmployerVerificationToolHandler
+from app.services.rule_engine import RULE_TIMEOUT_REASON, SOURCE_OF_FUNDS_ALLOWED_ORDERED
+from app.services.cache import TTLCache
+from app.services.http_client import get_http_client
 
+# Set up logging
+logger = logging.getLogger(__name__)
 
-class ChatService:
-    """Service for managing AI-powered chat conversations"""
+# Application fields included in the prompt context, in display order,
+# with the template used to render each one (only set fields are shown)
+_CONTEXT_TEMPLATES = (
+    ("currentAddress", "Current Address: {}"),
+    ("companyAddress", "Company Address: {}"),
+    ("employmentType", "Employment Type: {}"),
+    ("jobTitle", "Job Title: {}"),
+    ("companyName", "Company Name: {}"),
+    ("monthlyIncome", "Monthly Income: ${:,.2f}"),
+    ("sourceOfFunds", "Source of Funds: {}"),
+    ("currentAssets", "Current Assets: ${:,.2f}"),
+    ("countryIncomeSources", "Country Income Sources: {}"),
+)
+_CONTEXT_FIELDS = tuple(field for field, _ in _CONTEXT_TEMPLATES)
 
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set")
+# Characters stripped from the end of a user turn in cache keys
+_TRAILING_PUNCTUATION = string.punctuation + " "
 
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4o")
-        self.max_tokens = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
+# Shared read-only fallback for missing debugInfo entries (never mutated)
+_EMPTY_DICT: Dict[str, Any] = {}
 
-        # Initialize tool registry
-        self.tool_registry = ToolRegistry()
+# Alignment matrix reference for the source-of-funds prompt, rendered once
+_ALIGNMENT_MATRIX = "\n".join(
+    f"  - {emp_type}: {', '.join(sources)}"
+    for emp_type, sources in SOURCE_OF_FUNDS_ALLOWED_ORDERED.items()
+)
 
-        # Register tools
-        self.tool_registry.register(EmployerVerificationToolHandler())
 
-    def build_system_prompt(
-        self, red_flag: RedFlag, app_data: ApplicationData
-    ) -> str:
-        """
-        Generate context-aware system prompt for the AI assistant
+# Seconds to wait for the encoding at startup before giving up and estimating
+ENCODING_LOAD_TIMEOUT = 30.0
 
-        Args:
-            red_flag: The validation red flag to resolve
-            app_data: The application data for context
+# tiktoken encodings by model, filled by load_token_encoding (None: estimate)
+_encodings: Dict[str, Optional[tiktoken.Encoding]] = {}
+
+
+def _configured_model() -> str:
+    """Return the OpenAI model chats use"""
+    return os.getenv("OPENAI_MODEL", "gpt-4o")
 
-        Returns:
-            System prompt string
-        """
-        affected_fields_text = ", ".join(red_flag.affectedFields)
-
-        # Build context from application data (conditionally based on rule type)
-        context_parts = []
-
-        # For blacklist_check, provide minimal/no context
-        # The user just needs to defend/explain, not provide additional data
-        if red_flag.rule != "blacklist_check":
-            if app_data.currentAddress:
-                context_parts.append(f"Current Address: {app_data.currentAddress}")
-            if app_data.companyAddress:
-                context_parts.append(f"Company Address: {app_data.companyAddress}")
-            if app_data.employmentType:
-                context_parts.append(f"Employment Type: {app_data.employmentType}")
-            if app_data.jobTitle:
-                context_parts.append(f"Job Title: {app_data.jobTitle}")
-            if app_data.companyName:
-                context_parts.append(f"Company Name: {app_data.companyName}")
-            if app_data.monthlyIncome:
-                context_parts.append(f"Monthly Income: ${app_data.monthlyIncome:,.2f}")
-            if app_data.sourceOfFunds:
-                context_parts.append(f"Source of Funds: {app_data.sourceOfFunds}")
-            if app_data.currentAssets:
-                context_parts.append(f"Current Assets: ${app_data.currentAssets:,.2f}")
-            if app_data.countryIncomeSources:
-                context_parts.append(
-                    f"Country Income Sources: {app_data.countryIncomeSources}"
-                )
 
-        context = "\n".join(context_parts) if context_parts else "(No additional context provided)"
+def _load_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    Load the tiktoken encoding for a model, or None if it can't be loaded
 
-        system_prompt = f"""You are a helpful assistant helping the customer provide the right information to open their account.
+    Blocking: tiktoken downloads encoding files on first use (with no
+    timeout), so this only runs in a worker thread; see load_token_encoding.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Unknown model name - use the GPT-4o family encoding
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding for '{model}', estimating tokens: {e}")
+        return None
+
+
+async def load_token_encoding() -> None:
+    """
+    Load the chat model's tiktoken encoding off the event loop
+
+    Called on application startup. Until it has loaded (or if it can't be,
+    e.g. without network access) token counts fall back to a
+    characters-per-token estimate, so no request ever waits on the download.
+    """
+    model = _configured_model()
+    if model in _encodings:
+        return
+
+    try:
+        _encodings[model] = await asyncio.wait_for(
+            asyncio.to_thread(_load_encoding, model), timeout=ENCODING_LOAD_TIMEOUT
+        )
+    except TimeoutError:
+        logger.warning(f"Timed out loading tiktoken encoding for '{model}', estimating tokens")
+
+
+@lru_cache(maxsize=1)
+def _get_openai_client(api_key: str) -> AsyncOpenAI:
+    """
+    Return the shared OpenAI client
+
+    Requests go through the shared HTTP/2 client, so concurrent chats are
+    multiplexed over one keep-alive connection to api.openai.com. The SDK
+    retries 429/5xx responses with exponential backoff and jitter.
+    """
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "3")),
+        # Completions can outlast the shared client's 30s default, but a hung
+        # request should still fail well before the SDK's 10-minute default
+        timeout=httpx.Timeout(float(os.getenv("OPENAI_TIMEOUT", "60")), connect=5.0),
+        http_client=get_http_client(),
+    )
+
+
+# System prompt building blocks. Static scaffolding and the per-rule
+# guidance are complete strings; the per-request tail sections are templates
+# filled with str.format when a prompt is rendered
+_BASE_PROMPT = """You are a helpful assistant helping the customer provide the right information to open their account.
 To proceed, we must clear all validation red flags, as required by company policy and regulations.
 
 **Your Role:**
@@ -81,14 +135,6 @@ To proceed, we must clear all validation red flags, as required by company polic
 - Be friendly, professional, and concise.
 - 
 
-**Validation Issue Details:**
-- Rule: {red_flag.rule}
-- Message: {red_flag.message}
-- Affected Fields: {affected_fields_text}
-
-**Application Context:**
-{context}
-
 **Instructions:**
 1. If this is the first message (conversation history is empty), explain the issue, and ask the customer to explain the situation.
 2. Don't over share how we make the decision . The goal is to seek the truth but at the same time prevent fraud.
@@ -104,9 +150,8 @@ To proceed, we must clear all validation red flags, as required by company polic
 - Focus on helping them provide accurate information or valid explanations.
 - If they give a reasonable explanation, accept it as valid unless the red flag explicitly requires more detail."""
 
-        # Add rule-specific guidance (conditionally based on rule type)
-        if red_flag.rule == "blacklist_check":
-            system_prompt += """
+_RULE_GUIDANCE = {
+    "blacklist_check": """
 
 **Rule-Specific Guidance for Blacklist Check:**
 IMPORTANT: For the FIRST message, you MUST directly address the blacklist issue. Say something like:
@@ -124,65 +169,26 @@ Key points:
 - Use common sense to evaluate their explanation
 - If their explanation seems reasonable and credible, accept it
 - Focus on understanding the situation, not interrogating them
-- Be empathetic - being on a restricted list can be stressful"""
-
-        elif red_flag.rule == "distance_check":
-            # Extract Google geocoding status from debugInfo if available
-            geocoding_context = ""
-            if red_flag.debugInfo:
-                current_addr_info = red_flag.debugInfo.get("currentAddress", {})
-                company_addr_info = red_flag.debugInfo.get("companyAddress", {})
-
-                current_status = current_addr_info.get("google_status")
-                company_status = company_addr_info.get("google_status")
-
-                # Build context message for geocoding failures
-                if current_status and current_status != "OK":
-                    geocoding_context += f"\n- Current Address: Google Maps returned '{current_status}' (address could not be validated)"
-
-                if company_status and company_status != "OK":
-                    geocoding_context += f"\n- Company Address: Google Maps returned '{company_status}' (address could not be validated)"
-
-                if geocoding_context:
-                    geocoding_context = f"\n**Geocoding Issues:**{geocoding_context}\n"
-
-            system_prompt += f"""
+- Be empathetic - being on a restricted list can be stressful""",
+    "distance_check": """
 
 **Rule-Specific Guidance for Distance Check:**
-{geocoding_context}
 - The issue may be about addresses being far apart OR addresses that couldn't be validated by Google Maps
 - If Google Maps couldn't validate an address (ZERO_RESULTS, INVALID_REQUEST, etc.), ask the user to provide a complete, valid address
 - For distance issues (when addresses are valid but far apart): Customers may work remotely, visit the office only a few days per week, travel for work, or have multiple residences
 - Your job is to help clarify the situation, not to assume anything is wrong
-- Accept reasonable explanations about their work-life situation"""
-
-        elif red_flag.rule == "employer_verification_check":
-            # Extract Perplexity explanation from debugInfo if available
-            perplexity_context = ""
-            if red_flag.debugInfo and "perplexity_details" in red_flag.debugInfo:
-                perplexity_details = red_flag.debugInfo["perplexity_details"]
-                explanation = perplexity_details.get("explanation", "")
-                if explanation:
-                    perplexity_context = f"""
-
-**Initial Verification Context:**
-Our AI verification system already attempted to verify '{app_data.companyName}' and reported:
-"{explanation}"
-
-This gives you context about what went wrong (e.g., typo, incomplete name, not found in public records, multiple similar companies found)."""
-
-            system_prompt += f"""
+- Accept reasonable explanations about their work-life situation""",
+    "employer_verification_check": """
 
 **Rule-Specific Guidance for Employer Verification:**
 IMPORTANT: You have access to a TOOL called `verify_employer` that can check if a company is legitimate.
-{perplexity_context}
 
 **When to use the tool:**
 - When the user provides a CORRECTED company name (e.g., "It's actually SCB Bank, not SCB Bankk")
 - When the user provides additional information like a company website (to re-verify with more context)
 
 **How to help the user:**
-1. FIRST MESSAGE: Explain the verification issue using the context above. Ask clarifying questions like:
+1. FIRST MESSAGE: Explain the verification issue using the issue details below. Ask clarifying questions like:
    - "Could there be a typo in the company name?"
    - "Do you have the full official company name?"
    - "Do you have a company website or registration details?"
@@ -206,27 +212,13 @@ IMPORTANT: You have access to a TOOL called `verify_employer` that can check if
   * If it mentions a typo → ask them to provide the correct spelling
   * If it says "not found" → ask if they have a website or registration details
 - If user gives reasonable explanation but tool still fails after multiple attempts, document their explanation
-- Multiple attempts with corrected information are encouraged"""
-
-        elif red_flag.rule == "source_of_funds_alignment_check":
-            # Build alignment matrix table for AI reference
-            from app.services.rule_engine import SOURCE_OF_FUNDS_ALIGNMENT
-
-            alignment_matrix = "\n".join([
-                f"  - {emp_type}: {', '.join(sources)}"
-                for emp_type, sources in SOURCE_OF_FUNDS_ALIGNMENT.items()
-            ])
-
-            system_prompt += f"""
+- Multiple attempts with corrected information are encouraged""",
+    "source_of_funds_alignment_check": """
 
 **Rule-Specific Guidance for Source of Funds Alignment:**
 
-**Context - What Triggered This Flag:**
-- Employment Type: {app_data.employmentType or "(not provided)"}
-- Source of Funds: {app_data.sourceOfFunds or "(not provided)"}
-
 **Alignment Matrix (Reference):**
-{alignment_matrix}
+""" + _ALIGNMENT_MATRIX + """
 
 **Your Goal:**
 Match these two variables: Employment Type ↔ Source of Funds
@@ -252,10 +244,278 @@ Before you decide to PASS, you MUST:
 **Decision Making:**
 - DEFAULT: Follow the alignment matrix
 - PASS if: (a) Combination exists in matrix, OR (b) Genuine edge case with solid justification
-- If combination not in matrix but user clearly fits a different employment type → Help them reclassify
-"""
+- If combination not in matrix but user clearly fits a different employment type → Help them reclassify""",
+    # Any rule that ran out of time (see build_system_prompt)
+    "check_timeout": """
+
+**Guidance for an Incomplete Check:**
+IMPORTANT: This check did NOT find a problem. It could not be completed because a verification service took too long to respond.
+- Do not suggest that anything is wrong with the customer or their details
+- Do not mention restricted lists, fraud, or failed verification
+- Briefly explain that we couldn't finish checking the affected fields automatically, and ask the customer to confirm they are correct
+- Once the customer confirms, thank them and end the conversation""",
+}
+
+# Prompt rule used for any red flag raised because its rule timed out
+_TIMEOUT_PROMPT_RULE = "check_timeout"
+
+_DETAILS_TEMPLATE = """
+
+**Validation Issue Details:**
+- Rule: {rule}
+- Message: {message}
+- Affected Fields: {affected_fields_text}
+
+**Application Context:**
+{context}"""
+
+_GEOCODING_ISSUE_TEMPLATE = "\n- {label}: Google Maps returned '{status}' (address could not be validated)"
+
+_PERPLEXITY_CONTEXT_TEMPLATE = """
+
+**Initial Verification Context:**
+Our AI verification system already attempted to verify '{company_name}' and reported:
+"{perplexity_explanation}"
+
+This gives you context about what went wrong (e.g., typo, incomplete name, not found in public records, multiple similar companies found)."""
+
+_SOURCE_OF_FUNDS_CONTEXT_TEMPLATE = """
+
+**Context - What Triggered This Flag:**
+- Employment Type: {employment_type}
+- Source of Funds: {source_of_funds}"""
+
+
+def _normalize_turn(text: str) -> str:
+    """
+    Normalize a user turn for cache lookups
+
+    Collapses whitespace and strips trailing punctuation, so answers that
+    differ only in formatting map to the same cache key. Case is kept: the
+    cached reply or tool-call arguments echo the user's casing (company
+    names, URLs, IDs), so differently-cased turns must not share it.
+    """
+    return " ".join(text.split()).rstrip(_TRAILING_PUNCTUATION)
+
+
+# Tools made available to the model for each rule
+_RULE_TO_TOOLS: Dict[str, Tuple[str, ...]] = {
+    "employer_verification_check": ("verify_employer",),
+    # Future mappings:
+    # "distance_check": ("geocode_address", "calculate_distance"),
+    # "income_plausibility": ("check_income_benchmark",),
+}
+_NO_TOOLS: Tuple[str, ...] = ()
+
+
+@lru_cache(maxsize=1)
+def get_tool_registry() -> ToolRegistry:
+    """
+    Return the tool registry shared by every ChatService
+
+    Tool handlers hold no per-request state, so one set of handler objects
+    serves all chats. Built on first use rather than at import, since the
+    handlers construct their services, which read the environment, and
+    routers are imported before main.py loads .env.
+    """
+    registry = ToolRegistry()
+    registry.register(EmployerVerificationToolHandler())
+    return registry
+
+
+def _distance_details(
+    values: Dict[str, Any],
+    geocoding_statuses: Tuple[Optional[str], Optional[str]],
+    perplexity_explanation: str,
+) -> str:
+    """Geocoding failures reported by Google for the two addresses"""
+    # Build context message for geocoding failures
+    geocoding_context = "".join(
+        _GEOCODING_ISSUE_TEMPLATE.format(label=label, status=status)
+        for label, status in zip(("Current Address", "Company Address"), geocoding_statuses)
+        if status and status != "OK"
+    )
+
+    if not geocoding_context:
+        return ""
+
+    return f"\n\n**Geocoding Issues:**{geocoding_context}"
+
+
+def _employer_details(
+    values: Dict[str, Any],
+    geocoding_statuses: Tuple[Optional[str], Optional[str]],
+    perplexity_explanation: str,
+) -> str:
+    """What the initial Perplexity verification reported, if anything"""
+    if not perplexity_explanation:
+        return ""
+
+    return _PERPLEXITY_CONTEXT_TEMPLATE.format(
+        company_name=values["companyName"],
+        perplexity_explanation=perplexity_explanation,
+    )
+
+
+def _source_of_funds_details(
+    values: Dict[str, Any],
+    geocoding_statuses: Tuple[Optional[str], Optional[str]],
+    perplexity_explanation: str,
+) -> str:
+    """The employment type / source of funds pair that triggered the flag"""
+    return _SOURCE_OF_FUNDS_CONTEXT_TEMPLATE.format(
+        employment_type=values["employmentType"] or "(not provided)",
+        source_of_funds=values["sourceOfFunds"] or "(not provided)",
+    )
+
+
+# Per-request tail section builders by rule (rules without one add nothing)
+_RULE_DETAIL_HANDLERS: Dict[str, Callable[..., str]] = {
+    "distance_check": _distance_details,
+    "employer_verification_check": _employer_details,
+    "source_of_funds_alignment_check": _source_of_funds_details,
+}
+
+
+@lru_cache(maxsize=512)
+def _render_system_prompt(
+    rule: str,
+    message: str,
+    affected_fields_text: str,
+    app_values: Tuple[Any, ...],
+    geocoding_statuses: Tuple[Optional[str], Optional[str]],
+    perplexity_explanation: str,
+) -> str:
+    """
+    Render the system prompt from the values it depends on
+
+    Memoized: every argument is hashable, so repeat requests for the same red
+    flag and application context reuse the already-built prompt string.
+
+    Args:
+        rule: Red flag rule name
+        message: Red flag message
+        affected_fields_text: Red flag affected fields, comma-separated
+        app_values: Application values, in _CONTEXT_FIELDS order
+        geocoding_statuses: Google statuses for (current, company) address
+        perplexity_explanation: Initial Perplexity verification explanation
+
+    Returns:
+        System prompt string
+    """
+    values = dict(zip(_CONTEXT_FIELDS, app_values))
+
+    # Build context from application data (conditionally based on rule type)
+    # For blacklist_check, provide minimal/no context
+    # The user just needs to defend/explain, not provide additional data
+    context = ""
+    if rule != "blacklist_check":
+        context = "\n".join(
+            template.format(value)
+            for (_, template), value in zip(_CONTEXT_TEMPLATES, app_values)
+            if value
+        )
+
+    context = context or "(No additional context provided)"
 
-        return system_prompt
+    # Static scaffolding comes first and per-request values last, so all
+    # requests for a rule share the longest possible prompt prefix (OpenAI
+    # caches repeated prefixes of 1024+ tokens)
+    parts = [
+        _BASE_PROMPT,
+        _RULE_GUIDANCE.get(rule, ""),
+        _DETAILS_TEMPLATE.format(
+            rule=rule,
+            message=message,
+            affected_fields_text=affected_fields_text,
+            context=context,
+        ),
+    ]
+
+    # Rule-specific per-request details follow the shared prefix
+    if handler := _RULE_DETAIL_HANDLERS.get(rule):
+        parts.append(handler(values, geocoding_statuses, perplexity_explanation))
+
+    return "".join(parts)
+
+
+class ChatService:
+    """Service for managing AI-powered chat conversations"""
+
+    def __init__(self):
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+
+        self.client = _get_openai_client(api_key)
+        self.model = _configured_model()
+        self.max_tokens = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
+
+        # Prompt token budget; older conversation turns beyond it are dropped
+        self.history_token_budget = int(
+            os.getenv("OPENAI_HISTORY_TOKEN_BUDGET", "6000")
+        )
+
+        # Cap in-flight OpenAI calls so bursts queue here instead of
+        # tripping the account's rate limit (shared via get_chat_service)
+        self._semaphore = asyncio.Semaphore(
+            int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+        )
+
+        # Cache of completions keyed by request payload, so identical
+        # conversations (e.g. the first turn for a given red flag) skip the API
+        self._completion_cache = TTLCache(maxsize=1024, ttl=3600)
+
+        # Final first-turn replies keyed by system prompt hash (see _greeting_key)
+        self._greeting_cache = TTLCache(maxsize=10_000, ttl=3600)
+
+        # Tool registry (shared; handlers are stateless)
+        self.tool_registry = get_tool_registry()
+
+    def build_system_prompt(
+        self, red_flag: RedFlag, app_data: ApplicationData
+    ) -> str:
+        """
+        Generate context-aware system prompt for the AI assistant
+
+        Only the values the prompt reads are extracted here, so requests with
+        the same red flag and context share one memoized prompt.
+
+        Args:
+            red_flag: The validation red flag to resolve
+            app_data: The application data for context
+
+        Returns:
+            System prompt string
+        """
+        # Google geocoding statuses (distance_check) and the initial Perplexity
+        # explanation (employer_verification_check) from debugInfo if available
+        debug = red_flag.debugInfo or _EMPTY_DICT
+        geocoding_statuses = (None, None)
+        perplexity_explanation = ""
+
+        # A rule that ran out of time found nothing about the applicant, so it
+        # gets neutral guidance rather than the rule's own (which assumes it
+        # did, e.g. "your name appears in our restricted list")
+        rule = red_flag.rule
+        if debug.get("reason") == RULE_TIMEOUT_REASON:
+            rule = _TIMEOUT_PROMPT_RULE
+        elif rule == "distance_check":
+            geocoding_statuses = (
+                debug.get("currentAddress", _EMPTY_DICT).get("google_status"),
+                debug.get("companyAddress", _EMPTY_DICT).get("google_status"),
+            )
+        elif rule == "employer_verification_check" and "perplexity_details" in debug:
+            perplexity_explanation = debug["perplexity_details"].get("explanation", "")
+
+        return _render_system_prompt(
+            rule,
+            red_flag.message,
+            red_flag.affected_fields_text,
+            tuple(getattr(app_data, field) for field in _CONTEXT_FIELDS),
+            geocoding_statuses,
+            perplexity_explanation,
+        )
 
     async def send_message(
         self,
@@ -280,45 +540,230 @@ Before you decide to PASS, you MUST:
             Exception: If API call fails
         """
         try:
-            # Build system prompt
-            system_prompt = self.build_system_prompt(red_flag, app_data)
-
-            # Format messages for OpenAI API
-            messages = [{"role": "system", "content": system_prompt}]
-
-            # Add conversation history
-            for msg in conversation_history:
-                messages.append({"role": msg.role, "content": msg.content})
-
-            # Add user message if not initialization
-            if user_message:
-                messages.append({"role": "user", "content": user_message})
+            # Build system prompt and format messages for OpenAI API
+            messages = self.trim_history(self._build_messages(
+                user_message, red_flag, app_data, conversation_history
+            ))
 
             # Determine which tools to provide based on red flag
             tool_names = self._get_tools_for_rule(red_flag.rule)
-            tools = None
-            if tool_names:
-                tools = self.tool_registry.get_schemas(tool_names)
+            tools = self.tool_registry.get_schemas(tool_names) if tool_names else None
+
+            async def complete() -> str:
+                # Call OpenAI API
+                response = await self._create_completion(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=0.5,
+                    tools=tools if tools else None,
+                    tool_choice="auto" if tools else None
+                )
 
-            # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=self.max_tokens,
-                temperature=0.5,
-                tools=tools if tools else None,
-                tool_choice="auto" if tools else None
-            )
+                # Without tools offered the model can't call any, so the
+                # tool-handling path is only entered when tools were sent
+                if not tools:
+                    return response.choices[0].message.content or ""
+
+                # Handle response (may include tool calls)
+                return await self._handle_response(response, messages, red_flag, app_data)
 
-            # Handle response (may include tool calls)
-            return await self._handle_response(response, messages, red_flag, app_data)
+            # First-turn greetings depend only on the system prompt, so the
+            # final reply (including any tool round-trip) is cached whole
+            greeting_key = self._greeting_key(messages, user_message, conversation_history)
+            if greeting_key:
+                return await self._greeting_cache.get_or_fetch(greeting_key, complete)
+
+            return await complete()
 
         except Exception as e:
-            # Log error (in production, use proper logging)
-            print(f"Error calling OpenAI API: {e}")
+            logger.exception(f"Error calling OpenAI API: {e}")
             raise Exception(f"Failed to get AI response: {str(e)}")
 
-    def _get_tools_for_rule(self, rule: str) -> List[str]:
+    async def init_all(
+        self,
+        red_flags: List[RedFlag],
+        app_data: ApplicationData,
+    ) -> List[Any]:
+        """
+        Generate the opening message for several red flags concurrently
+
+        Each flag takes the normal initialization path (empty message, no
+        history), so cached greetings are reused. Calls to OpenAI remain
+        bounded by the service-wide concurrency semaphore.
+
+        Args:
+            red_flags: Red flags to open conversations for
+            app_data: Application data for context
+
+        Returns:
+            Opening message per red flag, in order. A flag whose call failed
+            gets its exception instead, so one failure doesn't discard the rest
+        """
+        return await asyncio.gather(
+            *(self.send_message("", red_flag, app_data, []) for red_flag in red_flags),
+            return_exceptions=True,
+        )
+
+    async def send_message_stream(
+        self,
+        user_message: str,
+        red_flag: RedFlag,
+        app_data: ApplicationData,
+        conversation_history: List[ChatMessage],
+    ) -> AsyncIterator[str]:
+        """
+        Send message to OpenAI and stream the response as it is generated
+
+        If the model calls tools, they are executed once its first stream
+        ends and the final answer is streamed from a second call.
+
+        Args:
+            user_message: The user's message (empty string for initialization)
+            red_flag: The red flag being discussed
+            app_data: Application data for context
+            conversation_history: Previous conversation messages
+
+        Yields:
+            Assistant's response content deltas
+
+        Raises:
+            Exception: If API call fails
+        """
+        messages = self.trim_history(self._build_messages(
+            user_message, red_flag, app_data, conversation_history
+        ))
+
+        # Replay a cached greeting as a single delta
+        greeting_key = self._greeting_key(messages, user_message, conversation_history)
+        greeting = self._greeting_cache.get(greeting_key) if greeting_key else None
+        if greeting is not None:
+            yield greeting
+            return
+
+        # Determine which tools to provide based on red flag
+        tool_names = self._get_tools_for_rule(red_flag.rule)
+        tools = self.tool_registry.get_schemas(tool_names) if tool_names else None
+
+        parts: List[str] = []
+        tool_calls: List[ChatCompletionMessageToolCall] = []
+        async with aclosing(self._stream_completion(messages, tools, tool_calls)) as deltas:
+            async for delta in deltas:
+                parts.append(delta)
+                yield delta
+
+        if tool_calls:
+            assistant_message = ChatCompletionMessage(
+                role="assistant", content="".join(parts) or None, tool_calls=tool_calls
+            )
+            direct_reply = await self._run_tool_calls(
+                messages, assistant_message, red_flag, app_data
+            )
+            if direct_reply:
+                parts.append(direct_reply)
+                yield direct_reply
+            else:
+                async with aclosing(self._stream_completion(messages)) as deltas:
+                    async for delta in deltas:
+                        parts.append(delta)
+                        yield delta
+
+        if greeting_key:
+            self._greeting_cache.set(greeting_key, "".join(parts))
+
+    def _greeting_key(
+        self,
+        messages: List[Dict[str, Any]],
+        user_message: str,
+        conversation_history: List[ChatMessage],
+    ) -> Optional[str]:
+        """
+        Return the greeting cache key for an initialization request
+
+        Args:
+            messages: Messages built for the request (system prompt first)
+            user_message: The user's message
+            conversation_history: Previous conversation messages
+
+        Returns:
+            SHA-256 of the system prompt for the initialization path (empty
+            message, no history), None for any other request
+        """
+        if user_message or conversation_history:
+            return None
+
+        return hashlib.sha256(messages[0]["content"].encode()).hexdigest()
+
+    def _build_messages(
+        self,
+        user_message: str,
+        red_flag: RedFlag,
+        app_data: ApplicationData,
+        conversation_history: List[ChatMessage],
+    ) -> List[Dict[str, Any]]:
+        """Build the OpenAI messages array for a red flag conversation"""
+        system_prompt = self.build_system_prompt(red_flag, app_data)
+
+        # System prompt, conversation history, then the user message (omitted
+        # for initialization), built in a single list display
+        return [
+            {"role": "system", "content": system_prompt},
+            *({"role": msg.role, "content": msg.content} for msg in conversation_history),
+            *(({"role": "user", "content": user_message},) if user_message else ()),
+        ]
+
+    def count_tokens(self, text: str) -> int:
+        """Count (or estimate, if no encoding is available) tokens in text"""
+        # Never loaded here: that would block the event loop on a download
+        encoding = _encodings.get(self.model)
+        if encoding is None:
+            return len(text) // 4 + 1
+
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def trim_history(
+        self, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Drop the oldest conversation turns that don't fit the token budget
+
+        The system prompt (first message) and the latest message are always
+        kept; earlier turns are kept newest-first while they fit.
+
+        Args:
+            messages: OpenAI messages array starting with the system prompt
+            max_tokens: Prompt token budget (defaults to history_token_budget)
+
+        Returns:
+            The messages array, or a trimmed copy if it exceeded the budget
+        """
+        if len(messages) <= 2:
+            return messages
+
+        budget = max_tokens or self.history_token_budget
+        # ~4 tokens of per-message overhead for role and separators
+        used = sum(
+            self.count_tokens(msg["content"]) + 4
+            for msg in (messages[0], messages[-1])
+        )
+
+        kept: List[Dict[str, Any]] = []
+        for msg in reversed(messages[1:-1]):
+            used += self.count_tokens(msg["content"]) + 4
+            if used > budget:
+                break
+            kept.append(msg)
+
+        if len(kept) == len(messages) - 2:
+            return messages
+
+        logger.warning(
+            f"Trimmed {len(messages) - 2 - len(kept)} of {len(messages) - 2} "
+            f"earlier messages to fit the {budget}-token prompt budget"
+        )
+        return [messages[0], *reversed(kept), messages[-1]]
+
+    def _get_tools_for_rule(self, rule: str) -> Tuple[str, ...]:
         """
         Determine which tools should be available for a given rule
 
@@ -326,16 +771,9 @@ Before you decide to PASS, you MUST:
             rule: Red flag rule name
 
         Returns:
-            List of tool names to make available
+            Tuple of tool names to make available
         """
-        tool_map = {
-            "employer_verification_check": ["verify_employer"],
-            # Future mappings:
-            # "distance_check": ["geocode_address", "calculate_distance"],
-            # "income_plausibility": ["check_income_benchmark"],
-        }
-
-        return tool_map.get(rule, [])
+        return _RULE_TO_TOOLS.get(rule, _NO_TOOLS)
 
     async def _handle_response(
         self,
@@ -351,65 +789,16 @@ Before you decide to PASS, you MUST:
         if not assistant_message.tool_calls:
             return assistant_message.content or ""
 
-        # Add assistant message with tool calls to history
-        messages.append({
-            "role": "assistant",
-            "content": assistant_message.content,
-            "tool_calls": [
-                {
-                    "id": tc.id,
-                    "type": tc.type,
-                    "function": {
-                        "name": tc.function.name,
-                        "arguments": tc.function.arguments
-                    }
-                }
-                for tc in assistant_message.tool_calls
-            ]
-        })
-
-        # Execute each tool call
-        for tool_call in assistant_message.tool_calls:
-            try:
-                # Parse arguments
-                import json
-                args = json.loads(tool_call.function.arguments)
-
-                # Build context for tool execution
-                context = {
-                    "red_flag": red_flag,
-                    "app_data": app_data
-                }
-
-                # Execute tool via registry
-                tool_result = await self.tool_registry.execute(
-                    tool_name=tool_call.function.name,
-                    arguments=args,
-                    context=context
-                )
-
-                # Add tool response to messages
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": tool_call.function.name,
-                    "content": tool_result
-                })
-
-            except Exception as e:
-                # Handle tool execution errors gracefully
-                error_message = f"Error executing tool '{tool_call.function.name}': {str(e)}"
-                print(f"Tool execution error: {error_message}")
-
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": tool_call.function.name,
-                    "content": f"❌ Tool execution failed: {str(e)}"
-                })
+        # The exchange is appended after the untouched system message, so the
+        # follow-up call re-sends a byte-identical (prefix-cacheable) prompt
+        direct_reply = await self._run_tool_calls(
+            messages, assistant_message, red_flag, app_data
+        )
+        if direct_reply:
+            return direct_reply
 
         # Get final response after tool execution
-        final_response = await self.client.chat.completions.create(
+        final_response = await self._create_completion(
             model=self.model,
             messages=messages,
             max_tokens=self.max_tokens,
@@ -418,6 +807,133 @@ Before you decide to PASS, you MUST:
 
         return final_response.choices[0].message.content or ""
 
+    async def _run_tool_calls(
+        self,
+        messages: List[Dict[str, Any]],
+        assistant_message: ChatCompletionMessage,
+        red_flag: RedFlag,
+        app_data: ApplicationData
+    ) -> Optional[str]:
+        """
+        Execute tool calls and append the exchange to messages
+
+        Args:
+            messages: Conversation messages (appended to in place)
+            assistant_message: Assistant message carrying the tool calls
+            red_flag: The red flag being discussed
+            app_data: Application data
+
+        Returns:
+            Reply to send without a second model call when every tool result
+            is deterministic (see ToolHandler.direct_reply), otherwise None
+        """
+        # Add assistant message with tool calls to history
+        messages.append(assistant_message.model_dump(exclude_none=True, mode="json"))
+
+        # Execute tool calls concurrently (they are independent I/O); gather
+        # keeps results in tool_calls order, as the API requires
+        results = await asyncio.gather(*(
+            self._exec_one(tool_call, red_flag, app_data)
+            for tool_call in assistant_message.tool_calls
+        ))
+        messages.extend(tool_message for tool_message, _ in results)
+
+        # Deterministic outcomes skip the model round-trip that would only
+        # rephrase them (duplicate replies are collapsed, order preserved)
+        replies = [reply for _, reply in results]
+        if replies and all(replies):
+            return "\n\n".join(dict.fromkeys(replies))
+
+        return None
+
+    async def _exec_one(
+        self,
+        tool_call: Any,
+        red_flag: RedFlag,
+        app_data: ApplicationData
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Execute a single tool call
+
+        Args:
+            tool_call: Tool call from the assistant message
+            red_flag: The red flag being discussed
+            app_data: Application data
+
+        Returns:
+            Tuple of (tool-role message carrying the result or the error,
+            the tool's direct reply for the result or None)
+        """
+        try:
+            # Parse arguments
+            args = json.loads(tool_call.function.arguments)
+
+            # Build context for tool execution
+            context = {
+                "red_flag": red_flag,
+                "app_data": app_data
+            }
+
+            # Execute tool via registry
+            tool_result = await self.tool_registry.execute(
+                tool_name=tool_call.function.name,
+                arguments=args,
+                context=context
+            )
+
+            tool_message = {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "name": tool_call.function.name,
+                "content": tool_result
+            }
+            direct_reply = self.tool_registry.direct_reply(
+                tool_call.function.name, args, tool_result
+            )
+            return tool_message, direct_reply
+
+        except Exception as e:
+            # Handle tool execution errors gracefully
+            logger.exception(f"Error executing tool '{tool_call.function.name}': {e}")
+
+            return {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "name": tool_call.function.name,
+                "content": f"❌ Tool execution failed: {str(e)}"
+            }, None
+
+    async def _create_completion(self, **params: Any) -> Any:
+        """
+        Create a chat completion, serving identical requests from cache
+
+        Args:
+            **params: Keyword arguments for `chat.completions.create`
+
+        Returns:
+            OpenAI chat completion response
+        """
+        # User turns are normalized in the key so trivially different answers
+        # ("I work  remotely" / "I work remotely.") share a cached reply
+        key_params = {
+            **params,
+            "messages": [
+                {**msg, "content": _normalize_turn(msg["content"])}
+                if msg["role"] == "user" else msg
+                for msg in params["messages"]
+            ],
+        }
+        key = hashlib.blake2b(
+            json.dumps(key_params, sort_keys=True, default=str).encode(),
+            digest_size=16,
+        ).digest()
+
+        async def fetch():
+            async with self._semaphore:
+                return await self.client.chat.completions.create(**params)
+
+        return await self._completion_cache.get_or_fetch(key, fetch)
+
     async def get_completion(self, messages: List[Dict[str, str]]) -> str:
         """
         Generic method to get completion from OpenAI
@@ -434,9 +950,9 @@ Before you decide to PASS, you MUST:
         """
         try:
             # Call OpenAI API with provided messages
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
-                messages=messages,
+                messages=self.trim_history(messages),
                 max_tokens=self.max_tokens,
                 temperature=0.5,
             )
@@ -450,6 +966,109 @@ Before you decide to PASS, you MUST:
             return assistant_message
 
         except Exception as e:
-            # Log error (in production, use proper logging)
-            print(f"Error calling OpenAI API: {e}")
+            logger.exception(f"Error calling OpenAI API: {e}")
+            raise Exception(f"Failed to get AI response: {str(e)}")
+
+    async def get_completion_stream(
+        self, messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """
+        Generic method to stream a completion from OpenAI
+
+        Args:
+            messages: List of message dicts with role/content
+                     (should include system prompt if needed)
+
+        Yields:
+            Assistant's response content deltas
+
+        Raises:
+            Exception: If API call fails
+        """
+        async with aclosing(self._stream_completion(self.trim_history(messages))) as deltas:
+            async for delta in deltas:
+                yield delta
+
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_calls: Optional[List[ChatCompletionMessageToolCall]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion content deltas for an already-built messages array
+
+        Args:
+            messages: Messages to send
+            tools: Tool schemas to offer the model, if any
+            tool_calls: When given, tool calls the model makes are reassembled
+                from their streamed fragments and appended here
+
+        Yields:
+            Assistant's response content deltas
+        """
+        tool_params = {"tools": tools, "tool_choice": "auto"} if tools else {}
+
+        # Tool-call fragments by index: id/name arrive first, arguments in pieces
+        fragments: Dict[int, Dict[str, str]] = {}
+
+        try:
+            # Hold the concurrency slot for the whole generation. Closing
+            # this generator (callers close it via aclosing, and the SSE
+            # response on client disconnect) releases the slot and the stream
+            async with self._semaphore:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=0.5,
+                    stream=True,
+                    **tool_params,
+                )
+
+                # Closing the stream releases its HTTP/2 stream on the shared
+                # client (and stops generation) on early exit, error or cancel
+                async with stream:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+
+                        delta = chunk.choices[0].delta
+                        if delta.content:
+                            yield delta.content
+
+                        for fragment in delta.tool_calls or ():
+                            call = fragments.setdefault(
+                                fragment.index, {"id": "", "name": "", "arguments": ""}
+                            )
+                            if fragment.id:
+                                call["id"] = fragment.id
+                            if fragment.function and fragment.function.name:
+                                call["name"] += fragment.function.name
+                            if fragment.function and fragment.function.arguments:
+                                call["arguments"] += fragment.function.arguments
+
+        except Exception as e:
+            logger.exception(f"Error streaming from OpenAI API: {e}")
             raise Exception(f"Failed to get AI response: {str(e)}")
+
+        if tool_calls is not None:
+            tool_calls.extend(
+                ChatCompletionMessageToolCall(
+                    id=call["id"],
+                    type="function",
+                    function=Function(name=call["name"], arguments=call["arguments"]),
+                )
+                for _, call in sorted(fragments.items())
+            )
+
+
+@lru_cache(maxsize=1)
+def get_chat_service() -> ChatService:
+    """
+    Return the shared ChatService instance (created on first use)
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    return ChatService()
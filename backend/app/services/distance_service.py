@@ -1,7 +1,57 @@
-import httpx
+import asyncio
+import logging
 import os
-from geopy.distance import geodesic
-from typing import Optional, Tuple
+from functools import lru_cache
+from math import asin, cos, radians, sin, sqrt
+from typing import List, Optional, Tuple
+from app.services.cache import TTLCache
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import AsyncTokenBucket
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Google permits caching geocoding results for up to 30 days; a day keeps
+# repeat addresses off the network while still picking up map corrections
+GEOCODE_CACHE_TTL = 86400.0
+
+# Statuses that describe the address itself (not quota/transport trouble)
+# are cached briefly, so a bad address isn't re-sent on every retry but a
+# corrected one is picked up soon
+NEGATIVE_GEOCODE_STATUSES = frozenset({"ZERO_RESULTS", "INVALID_REQUEST"})
+NEGATIVE_GEOCODE_CACHE_TTL = 900.0
+
+# Mean Earth radius (IUGG), in km
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """
+    Great-circle distance between two (lat, lng) points in km
+
+    Within ~0.5% of the ellipsoidal geodesic, which is plenty for a
+    150 km proximity check and far cheaper to compute.
+    """
+    lat1, lng1 = radians(a[0]), radians(a[1])
+    lat2, lng2 = radians(b[0]), radians(b[1])
+    h = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(h))
+
+
+@lru_cache(maxsize=4096)
+def _address_key(address: str) -> str:
+    """Normalize an address for cache lookups and comparisons"""
+    return " ".join(address.lower().split())
+
+
+def _geocode_ttl(result: Tuple[Optional[Tuple[float, float]], str]) -> Optional[float]:
+    """Cache lifetime for a geocode result (None: don't cache, retry next time)"""
+    status = result[1]
+    if status == "OK":
+        return GEOCODE_CACHE_TTL
+    if status in NEGATIVE_GEOCODE_STATUSES:
+        return NEGATIVE_GEOCODE_CACHE_TTL
+    return None
 
 
 class DistanceService:
@@ -11,6 +61,12 @@ class DistanceService:
         self.api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         self.geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
 
+        # Geocodes by normalized address (concurrent misses coalesce)
+        self._geocode_cache = TTLCache(maxsize=1024, ttl=GEOCODE_CACHE_TTL)
+
+        # Stay under the Geocoding API's per-second quota (cache hits are free)
+        self._google_bucket = AsyncTokenBucket(rate=50, capacity=50)
+
     async def geocode_address(self, address: str) -> Tuple[Optional[Tuple[float, float]], str]:
         """
         Convert address to (latitude, longitude) using Google Geocoding API
@@ -29,29 +85,62 @@ class DistanceService:
         if not address or not address.strip():
             return (None, "EMPTY_ADDRESS")
 
+        return await self._geocode_cache.get_or_fetch(
+            _address_key(address),
+            lambda: self._fetch_geocode(address),
+            ttl=_geocode_ttl,
+        )
+
+    async def geocode_many(
+        self,
+        addresses: List[str],
+        max_concurrency: int = 10
+    ) -> List[Tuple[Optional[Tuple[float, float]], str]]:
+        """
+        Geocode several addresses concurrently
+
+        Duplicate addresses share one lookup through the geocode cache.
+
+        Args:
+            addresses: Address strings to geocode
+            max_concurrency: Maximum number of lookups in flight at once
+
+        Returns:
+            List of ((lat, lng) or None, google_status_code), in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def geocode_one(address: str) -> Tuple[Optional[Tuple[float, float]], str]:
+            async with semaphore:
+                return await self.geocode_address(address)
+
+        return await asyncio.gather(*(geocode_one(address) for address in addresses))
+
+    async def _fetch_geocode(self, address: str) -> Tuple[Optional[Tuple[float, float]], str]:
+        """Geocode an address with the Google Geocoding API (uncached)"""
         params = {
             "address": address,
             "key": self.api_key
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(self.geocode_url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-
-                if data["status"] == "OK" and len(data["results"]) > 0:
-                    location = data["results"][0]["geometry"]["location"]
-                    return ((location["lat"], location["lng"]), "OK")
-                else:
-                    # Return Google's actual error status
-                    google_status = data.get("status", "UNKNOWN_ERROR")
-                    print(f"Geocoding failed for '{address}': {google_status}")
-                    return (None, google_status)
-
-            except Exception as e:
-                print(f"Error geocoding address '{address}': {e}")
-                return (None, "UNKNOWN_ERROR")
+        try:
+            await self._google_bucket.acquire()
+            response = await get_http_client().get(self.geocode_url, params=params, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+
+            if data["status"] == "OK" and len(data["results"]) > 0:
+                location = data["results"][0]["geometry"]["location"]
+                return ((location["lat"], location["lng"]), "OK")
+            else:
+                # Return Google's actual error status
+                google_status = data.get("status", "UNKNOWN_ERROR")
+                logger.warning(f"Geocoding failed for '{address}': {google_status}")
+                return (None, google_status)
+
+        except Exception as e:
+            logger.error(f"Error geocoding address '{address}': {e}")
+            return (None, "UNKNOWN_ERROR")
 
     async def calculate_distance(
         self,
@@ -71,15 +160,23 @@ class DistanceService:
             - Success: (15.5, "OK", "OK")
             - Failure: (None, "ZERO_RESULTS", "OK")
         """
-        # Geocode both addresses
-        coords_a, status_a = await self.geocode_address(address_a)
-        coords_b, status_b = await self.geocode_address(address_b)
+        # The same address twice is trivially 0 km apart; geocode it once so
+        # an unresolvable address still reports its real status
+        if _address_key(address_a) == _address_key(address_b):
+            coords, status = await self.geocode_address(address_a)
+            return (0.0 if coords else None, status, status)
+
+        # Geocode both addresses concurrently
+        (coords_a, status_a), (coords_b, status_b) = await asyncio.gather(
+            self.geocode_address(address_a),
+            self.geocode_address(address_b),
+        )
 
         if not coords_a or not coords_b:
             return (None, status_a, status_b)
 
-        # Calculate geodesic distance
-        distance_km = geodesic(coords_a, coords_b).kilometers
+        # Calculate great-circle distance
+        distance_km = _haversine_km(coords_a, coords_b)
 
         return (distance_km, status_a, status_b)
 
@@ -108,3 +205,36 @@ class DistanceService:
 
         is_within_limit = distance <= limit_km
         return (is_within_limit, distance, status_a, status_b)
+
+    def check_distance_within_limit_coords(
+        self,
+        coords_a: Optional[Tuple[float, float]],
+        coords_b: Optional[Tuple[float, float]],
+        limit_km: float = 150.0
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Check if two already-geocoded points are within the distance limit
+
+        Lets callers that geocoded the addresses themselves (e.g. to report
+        Google's status) skip looking them up again.
+
+        Args:
+            coords_a: First (lat, lng), or None if geocoding failed
+            coords_b: Second (lat, lng), or None if geocoding failed
+            limit_km: Maximum allowed distance in km (default: 150)
+
+        Returns:
+            Tuple of (is_within_limit, actual_distance_km or None)
+        """
+        if not coords_a or not coords_b:
+            # If we can't calculate distance, we can't verify
+            return (False, None)
+
+        distance = _haversine_km(coords_a, coords_b)
+        return (distance <= limit_km, distance)
+
+
+@lru_cache(maxsize=1)
+def get_distance_service() -> DistanceService:
+    """Return the shared DistanceService instance, so its geocode cache is reused"""
+    return DistanceService()
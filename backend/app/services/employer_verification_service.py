@@ -9,13 +9,176 @@ Validates employer legitimacy through three independent sources:
 Logic: If ANY check passes → PASS | If ALL checks fail → FAIL
 """
 
-import httpx
 import csv
+import hashlib
 import io
 import os
+import re
 import asyncio
-from typing import Optional, Dict, Any, Set
-from datetime import datetime, timedelta
+import logging
+import time
+import unicodedata
+import orjson
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet
+from app.services.cache import TTLCache
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import AsyncTokenBucket
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# How long registry and web-search answers are reused per company
+DATAFORTHAI_CACHE_TTL = 86400.0
+PERPLEXITY_CACHE_TTL = 43200.0
+
+# How long whole verification verdicts are reused; failures expire sooner so
+# a newly allowlisted or corrected company is picked up quickly
+VERIFICATION_PASS_TTL = 86400.0
+VERIFICATION_FAIL_TTL = 3600.0
+
+# System prompt with Thailand securities broker context
+_PERPLEXITY_SYSTEM_PROMPT = """You are assisting a licensed securities broker in Thailand to verify a client's declared occupation and employer from their trading account application.
+Your current task is ONLY to decide whether the given employer is a legitimate business entity.
+
+Use reliable public web sources such as:
+- Google and Google Maps
+- Company website and credible news sources
+- Thailand DBD (Department of Business Development)
+- DataForThai
+- SET and SEC registries
+- Well-known international business directories (Bloomberg, Reuters, Crunchbase, LinkedIn company pages)
+- Other trusted Thai business registries
+
+Guidelines:
+- Consider a business legitimate if there is clear, consistent evidence that it exists as a real company or registered business entity.
+- If the name is too generic, ambiguous, or refers to multiple different entities and you cannot tell which one the client means, treat it as NO.
+- If you find strong evidence it is a scam, fake company, or unrelated to a business, treat it as NO.
+- When information is limited or conflicting, err on the side of NO rather than guessing.
+- Companies outside Thailand must have a possibility of a presence in Thailand. Use common sense: a local bakery in rural America would be NO, but a Malaysia software company would be YES.
+
+**Securities Industry Exclusion:**
+- Companies in the securities/brokerage industry must be NO (regulatory requirement)
+
+You must return the result as a JSON object with this structure:
+{
+  "result": "YES or NO in uppercase",
+  "explanation": "short explanation of why you decided YES or NO, referencing the evidence used",
+  "closest_company_name": "the closest matching company name you found, or null if none",
+  "closest_company_website": "the main website of the closest matching company, or null if none"
+}
+
+Follow the JSON structure exactly. Do not include any fields other than these four."""
+_PERPLEXITY_SYSTEM_MESSAGE = {"role": "system", "content": _PERPLEXITY_SYSTEM_PROMPT}
+
+# JSON schema for structured output
+_PERPLEXITY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "schema": {
+            "type": "object",
+            "properties": {
+                "result": {
+                    "type": "string",
+                    "enum": ["YES", "NO"]
+                },
+                "explanation": {
+                    "type": "string"
+                },
+                "closest_company_name": {
+                    "type": ["string", "null"]
+                },
+                "closest_company_website": {
+                    "type": ["string", "null"]
+                }
+            },
+            "required": ["result", "explanation"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# ASCII punctuation is dropped before matching ("Co., Ltd." -> "co ltd");
+# unlike [^\w\s] this leaves Thai combining vowel marks intact
+_PUNCTUATION_TABLE = str.maketrans("", "", "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~")
+
+# Legal-form suffixes that don't distinguish one company from another
+_COMPANY_SUFFIX_RE = re.compile(
+    r"(?:\s+(?:public company limited|company limited|co ltd|ltd|limited|"
+    r"co|company|inc|incorporated|corp|corporation|plc|pcl|llc))+$"
+)
+
+# Names (see _clean_company_text) that are clearly not an employer; these
+# fail without spending a Perplexity query
+_PLACEHOLDER_COMPANY_NAMES = frozenset({
+    "test", "asdf", "na", "none", "nil", "null", "unknown", "xxx", "ไม่มี",
+})
+
+
+def _clean_company_text(name: str) -> str:
+    """Lowercase, remove punctuation and collapse whitespace in a company name"""
+    return " ".join(name.lower().translate(_PUNCTUATION_TABLE).split())
+
+
+@lru_cache(maxsize=4096)
+def _normalize_company(name: str) -> str:
+    """
+    Reduce a company name to its allowlist lookup key
+
+    Lowercases, removes punctuation, collapses whitespace and strips
+    trailing legal-form suffixes, so "Siam Cement Co., Ltd." and
+    "siam cement" share a key.
+    """
+    return _COMPANY_SUFFIX_RE.sub("", _clean_company_text(name))
+
+
+def _parse_allowlist(csv_content: str) -> FrozenSet[str]:
+    """
+    Parse the allowlist CSV export into a set of company name keys
+
+    Args:
+        csv_content: Raw CSV text with a company_name column
+
+    Returns:
+        Frozenset of normalized company names (see _normalize_company)
+    """
+    csv_reader = csv.reader(io.StringIO(csv_content))
+
+    # Resolve the column position once from the header; strip handles
+    # "Company_Name " with trailing space
+    header = [h.strip().lower() for h in next(csv_reader, [])]
+    if "company_name" not in header:
+        return frozenset()
+    idx = header.index("company_name")
+
+    allowlist = set()
+    for row in csv_reader:
+        if len(row) > idx:
+            # Uncached: sheet rows would just evict the names being looked up
+            company_name = _normalize_company.__wrapped__(row[idx])
+            if company_name:
+                allowlist.add(company_name)
+
+    return frozenset(allowlist)
+
+
+def _verification_key(text: Optional[str]) -> str:
+    """Fold width/compatibility forms, case and spacing for verdict cache keys"""
+    return " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+
+
+def _verification_ttl(result: Dict[str, Any]) -> Optional[float]:
+    """
+    Cache lifetime for a verification verdict
+
+    A FAIL is only cached when Perplexity actually answered; if it errored,
+    the FAIL says nothing about the company and is retried next time.
+    """
+    if result["passed"]:
+        return VERIFICATION_PASS_TTL
+    if "perplexity_details" in result:
+        return VERIFICATION_FAIL_TTL
+    return None
 
 
 class EmployerVerificationService:
@@ -23,64 +186,133 @@ class EmployerVerificationService:
 
     def __init__(self):
         # Google Sheets allowlist cache
-        self.allowlist: Set[str] = set()
-        self.last_fetch: Optional[datetime] = None
-        self.cache_duration = timedelta(hours=1)
+        self.allowlist: FrozenSet[str] = frozenset()  # normalized names
+        self.last_fetch: Optional[float] = None  # time.monotonic() of last successful fetch
+        self.cache_duration = 3600.0  # seconds
         self.sheet_url = os.getenv(
             "EMPLOYER_ALLOWLIST_SHEET_URL",
             "https://docs.google.com/spreadsheets/d/1FIZ9GabtynZvnaXAcqaTtUG3hM1M4mt95gFc3YgxC9k/export?format=csv"
         )
 
+        # Serializes refreshes so concurrent requests trigger a single fetch
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Validators from the last export, sent back so an unchanged sheet
+        # answers 304 Not Modified with no body to download or parse
+        self._allowlist_etag: Optional[str] = None
+        self._allowlist_last_modified: Optional[str] = None
+
         # Perplexity API
         self.perplexity_api_key = os.getenv("PERPLEXITY_API_KEY")
         self.perplexity_model = "sonar"
 
-    async def fetch_allowlist(self) -> Set[str]:
+        # Request parts that don't depend on the company being checked
+        self._perplexity_headers = {
+            "Authorization": f"Bearer {self.perplexity_api_key}",
+            "Content-Type": "application/json"
+        }
+        self._perplexity_payload = {
+            "model": self.perplexity_model,
+            "max_tokens": 256,
+            "temperature": 0.0,
+            "response_format": _PERPLEXITY_RESPONSE_FORMAT
+        }
+
+        # Answered lookups per company (concurrent misses coalesce); errors
+        # aren't cached so they are retried on the next verification
+        self._dataforthai_cache = TTLCache(maxsize=1024, ttl=DATAFORTHAI_CACHE_TTL)
+        self._perplexity_cache = TTLCache(maxsize=1024, ttl=PERPLEXITY_CACHE_TTL)
+        self._verification_cache = TTLCache(maxsize=10_000, ttl=VERIFICATION_PASS_TTL)
+
+        # Queue bursts instead of tripping the providers' rate limits
+        self._dataforthai_bucket = AsyncTokenBucket(rate=2, capacity=5)
+        self._perplexity_bucket = AsyncTokenBucket(rate=5, capacity=10)
+
+    async def fetch_allowlist(self) -> Optional[FrozenSet[str]]:
         """
         Fetch employer allowlist from Google Sheets CSV export
 
+        The request is conditional on the previous export's validators, so
+        an unchanged sheet returns the current allowlist without a download.
+
         Returns:
-            Set of company names in lowercase
+            Frozenset of normalized company names, or None if the fetch failed
         """
+        headers = {}
+        if self._allowlist_etag:
+            headers["If-None-Match"] = self._allowlist_etag
+        if self._allowlist_last_modified:
+            headers["If-Modified-Since"] = self._allowlist_last_modified
+
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(self.sheet_url, timeout=10.0)
-                response.raise_for_status()
+            response = await get_http_client().get(
+                self.sheet_url, headers=headers, follow_redirects=True, timeout=10.0
+            )
 
-                # Parse CSV content
-                csv_content = response.text
-                print(f"[Employer Allowlist] CSV Content:\n{csv_content}")
-                csv_reader = csv.DictReader(io.StringIO(csv_content))
+            # Sheet unchanged since the last export; keep the current allowlist
+            if response.status_code == 304:
+                logger.info("Employer allowlist not modified")
+                return self.allowlist
 
-                allowlist = set()
-                for row in csv_reader:
-                    # Strip whitespace from keys and normalize to lowercase for case-insensitive matching
-                    row_cleaned = {k.strip().lower(): v for k, v in row.items()}
-                    company_name = row_cleaned.get("company_name", "").strip().lower()
+            response.raise_for_status()
+            self._allowlist_etag = response.headers.get("etag")
+            self._allowlist_last_modified = response.headers.get("last-modified")
 
-                    if company_name:
-                        allowlist.add(company_name)
+            # Parse CSV content in a worker thread so a large sheet
+            # doesn't block the event loop for concurrent requests
+            allowlist = await asyncio.to_thread(_parse_allowlist, response.text)
 
-                print(f"✓ Employer allowlist fetched: {len(allowlist)} entries")
-                print(f"  Allowlist contents: {allowlist}")
-                return allowlist
+            logger.info(f"Employer allowlist fetched: {len(allowlist)} entries")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Allowlist contents: {allowlist}")
+            return allowlist
 
         except Exception as e:
-            print(f"Error fetching employer allowlist: {e}")
-            return set()
+            # Callers keep serving the previous allowlist
+            logger.error(f"Error fetching employer allowlist: {e}")
+            return None
+
+    def _is_stale(self) -> bool:
+        """Check if the cached allowlist has expired or was never loaded"""
+        return (self.last_fetch is None or
+                time.monotonic() - self.last_fetch > self.cache_duration)
+
+    async def _refresh(self) -> None:
+        """
+        Fetch the allowlist and swap it in
+
+        Failed fetches keep the current allowlist and leave it marked stale
+        so the next call retries.
+        """
+        async with self._refresh_lock:
+            # Another coroutine may have refreshed while we waited for the lock
+            if not self._is_stale():
+                return
+
+            allowlist = await self.fetch_allowlist()
+            if allowlist is not None:
+                self.allowlist = allowlist
+                self.last_fetch = time.monotonic()
 
     async def refresh_cache_if_needed(self) -> None:
         """
-        Refresh allowlist cache if expired or empty
+        Refresh allowlist cache if expired or never loaded
+
+        The first load is awaited. After that, a stale allowlist keeps being
+        served while a single background task refreshes it
+        (stale-while-revalidate), so no verification waits on Google Sheets.
         """
-        now = datetime.now()
+        if not self._is_stale():
+            return
 
-        if (not self.allowlist or
-            self.last_fetch is None or
-            now - self.last_fetch > self.cache_duration):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
 
-            self.allowlist = await self.fetch_allowlist()
-            self.last_fetch = now
+        # The first load is awaited through a shield, so a caller that times
+        # out or is cancelled doesn't abort the fetch for everyone else
+        if self.last_fetch is None:
+            await asyncio.shield(self._refresh_task)
 
     async def check_google_sheet_allowlist(self, company_name: str) -> bool:
         """
@@ -96,71 +328,91 @@ class EmployerVerificationService:
             # Refresh cache if needed
             await self.refresh_cache_if_needed()
 
-            # Normalize to lowercase for case-insensitive matching
-            company_name_lower = company_name.strip().lower()
-
-            # Check if in allowlist
-            is_allowed = company_name_lower in self.allowlist
-            print(f"[Google Sheet Check] '{company_name}' -> {'PASS' if is_allowed else 'FAIL'}")
+            # Match on the normalized name so case, punctuation and legal
+            # suffixes don't send a listed company on to Perplexity
+            is_allowed = _normalize_company(company_name) in self.allowlist
+            logger.info(f"[Google Sheet Check] '{company_name}' -> {'PASS' if is_allowed else 'FAIL'}")
             return is_allowed
 
         except Exception as e:
-            print(f"Error in Google Sheet check: {e}")
+            logger.error(f"Error in Google Sheet check: {e}")
             return False
 
-    async def check_dataforthai_registry(self, company_name: str) -> bool:
+    async def check_dataforthai_registry(self, company_name: str, no_cache: bool = False) -> bool:
         """
         Check if company exists in DataForThai business registry
 
         Args:
             company_name: Company name to search
+            no_cache: Query the registry even if a cached answer exists
 
         Returns:
             True if company found, False otherwise
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                # DataForThai API requires specific headers (especially referer and x-requested-with)
-                response = await client.post(
-                    "https://www.dataforthai.com/api/company",
-                    data={
-                        "mode": "search_comp",
-                        "data[searchtext]": company_name
-                    },
-                    headers={
-                        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                        "Accept": "application/json, text/javascript, */*; q=0.01",
-                        "Referer": f"https://www.dataforthai.com/business/search/{company_name}",
-                        "X-Requested-With": "XMLHttpRequest",
-                        "Origin": "https://www.dataforthai.com",
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
-                    },
-                    timeout=10.0
-                )
-                response.raise_for_status()
+        if no_cache:
+            return bool(await self._query_dataforthai(company_name))
 
-                data = response.json()
+        is_found = await self._dataforthai_cache.get_or_fetch(
+            " ".join(company_name.lower().split()),
+            lambda: self._query_dataforthai(company_name),
+            ttl=lambda result: DATAFORTHAI_CACHE_TTL if result is not None else None,
+        )
+        return bool(is_found)
 
-                # Check if search was successful and returned results
-                is_found = (
-                    data.get("status") == "1" and
-                    isinstance(data.get("data"), list) and
-                    len(data.get("data", [])) > 0
+    async def _query_dataforthai(self, company_name: str) -> Optional[bool]:
+        """Search the DataForThai registry (uncached); None if the request failed"""
+        try:
+            await self._dataforthai_bucket.acquire()
+
+            # DataForThai API requires specific headers (especially referer and x-requested-with)
+            response = await get_http_client().post(
+                "https://www.dataforthai.com/api/company",
+                data={
+                    "mode": "search_comp",
+                    "data[searchtext]": company_name
+                },
+                headers={
+                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+                    "Accept": "application/json, text/javascript, */*; q=0.01",
+                    "Referer": f"https://www.dataforthai.com/business/search/{company_name}",
+                    "X-Requested-With": "XMLHttpRequest",
+                    "Origin": "https://www.dataforthai.com",
+                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
+                },
+                timeout=10.0
+            )
+            response.raise_for_status()
+
+            data = orjson.loads(response.content)
+
+            # Check if search was successful and returned results
+            is_found = (
+                data.get("status") == "1" and
+                isinstance(data.get("data"), list) and
+                len(data.get("data", [])) > 0
+            )
+
+            if is_found:
+                logger.info(
+                    f"[DataForThai Check] '{company_name}' -> PASS (found {len(data['data'])} matches, "
+                    f"first: {data['data'][0].get('jp_tname', 'N/A')})"
                 )
+            else:
+                logger.info(f"[DataForThai Check] '{company_name}' -> FAIL (no matches)")
 
-                if is_found:
-                    print(f"[DataForThai Check] '{company_name}' -> PASS (found {len(data['data'])} matches)")
-                    print(f"  First match: {data['data'][0].get('jp_tname', 'N/A')}")
-                else:
-                    print(f"[DataForThai Check] '{company_name}' -> FAIL (no matches)")
-
-                return is_found
+            return is_found
 
         except Exception as e:
-            print(f"Error in DataForThai check: {e}")
-            return False
+            logger.error(f"Error in DataForThai check: {e}")
+            return None
 
-    async def check_perplexity_web(self, company_name: str, website: Optional[str], additional_context: Optional[str] = None) -> tuple[bool, Optional[Dict[str, Any]]]:
+    async def check_perplexity_web(
+        self,
+        company_name: str,
+        website: Optional[str],
+        additional_context: Optional[str] = None,
+        no_cache: bool = False
+    ) -> tuple[bool, Optional[Dict[str, Any]]]:
         """
         Check if company appears legitimate via Perplexity web search
         using JSON structured output for Thailand securities broker compliance
@@ -169,121 +421,81 @@ class EmployerVerificationService:
             company_name: Company name to verify
             website: Optional company website for additional context
             additional_context: Optional additional details (address, industry, what they do, etc.)
+            no_cache: Ask Perplexity even if a cached answer exists
 
         Returns:
             Tuple of (is_legitimate: bool, response_data: dict or None)
         """
+        if no_cache:
+            return await self._query_perplexity(company_name, website, additional_context)
+
+        # The answer depends on every input that goes into the prompt
+        key = hashlib.blake2b(
+            "|".join((" ".join(company_name.lower().split()), website or "", additional_context or "")).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        # Only answered queries are cached (response_data is None on errors)
+        return await self._perplexity_cache.get_or_fetch(
+            key,
+            lambda: self._query_perplexity(company_name, website, additional_context),
+            ttl=lambda result: PERPLEXITY_CACHE_TTL if result[1] is not None else None,
+        )
+
+    async def _query_perplexity(
+        self,
+        company_name: str,
+        website: Optional[str],
+        additional_context: Optional[str] = None
+    ) -> tuple[bool, Optional[Dict[str, Any]]]:
+        """Ask Perplexity whether the company is legitimate (uncached)"""
         if not self.perplexity_api_key:
-            print("[Perplexity Check] API key not configured, skipping")
+            logger.warning("[Perplexity Check] API key not configured, skipping")
             return False, None
 
         try:
-            # System prompt with Thailand securities broker context
-            system_prompt = """You are assisting a licensed securities broker in Thailand to verify a client's declared occupation and employer from their trading account application.
-Your current task is ONLY to decide whether the given employer is a legitimate business entity.
-
-Use reliable public web sources such as:
-- Google and Google Maps
-- Company website and credible news sources
-- Thailand DBD (Department of Business Development)
-- DataForThai
-- SET and SEC registries
-- Well-known international business directories (Bloomberg, Reuters, Crunchbase, LinkedIn company pages)
-- Other trusted Thai business registries
-
-Guidelines:
-- Consider a business legitimate if there is clear, consistent evidence that it exists as a real company or registered business entity.
-- If the name is too generic, ambiguous, or refers to multiple different entities and you cannot tell which one the client means, treat it as NO.
-- If you find strong evidence it is a scam, fake company, or unrelated to a business, treat it as NO.
-- When information is limited or conflicting, err on the side of NO rather than guessing.
-- Companies outside Thailand must have a possibility of a presence in Thailand. Use common sense: a local bakery in rural America would be NO, but a Malaysia software company would be YES.
-
-**Securities Industry Exclusion:**
-- Companies in the securities/brokerage industry must be NO (regulatory requirement)
-
-You must return the result as a JSON object with this structure:
-{
-  "result": "YES or NO in uppercase",
-  "explanation": "short explanation of why you decided YES or NO, referencing the evidence used",
-  "closest_company_name": "the closest matching company name you found, or null if none",
-  "closest_company_website": "the main website of the closest matching company, or null if none"
-}
-
-Follow the JSON structure exactly. Do not include any fields other than these four."""
+            await self._perplexity_bucket.acquire()
 
             # User message
             website_text = f"Their website is: {website}." if website else ""
             context_text = f"Additional context: {additional_context}." if additional_context else ""
             user_message = f'Company name: "{company_name}".\n{website_text}\n{context_text}'.strip()
 
-            # JSON schema for structured output
-            response_format = {
-                "type": "json_schema",
-                "json_schema": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "result": {
-                                "type": "string",
-                                "enum": ["YES", "NO"]
-                            },
-                            "explanation": {
-                                "type": "string"
-                            },
-                            "closest_company_name": {
-                                "type": ["string", "null"]
-                            },
-                            "closest_company_website": {
-                                "type": ["string", "null"]
-                            }
-                        },
-                        "required": ["result", "explanation"],
-                        "additionalProperties": False
-                    }
-                }
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.perplexity.ai/chat/completions",
-                    json={
-                        "model": self.perplexity_model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_message}
-                        ],
-                        "max_tokens": 256,
-                        "temperature": 0.0,
-                        "response_format": response_format
-                    },
-                    headers={
-                        "Authorization": f"Bearer {self.perplexity_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=15.0
+            response = await get_http_client().post(
+                "https://api.perplexity.ai/chat/completions",
+                json={
+                    **self._perplexity_payload,
+                    "messages": [
+                        _PERPLEXITY_SYSTEM_MESSAGE,
+                        {"role": "user", "content": user_message}
+                    ]
+                },
+                headers=self._perplexity_headers,
+                timeout=15.0
+            )
+            response.raise_for_status()
+
+            data = orjson.loads(response.content)
+            content = data["choices"][0]["message"]["content"]
+
+            # Parse JSON response
+            result_data = orjson.loads(content)
+
+            # Only YES passes
+            is_legitimate = result_data.get("result") == "YES"
+
+            logger.info(f"[Perplexity Check] '{company_name}' -> {'PASS' if is_legitimate else 'FAIL'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Perplexity result: {result_data.get('result')}, "
+                    f"matched: {result_data.get('closest_company_name')}, "
+                    f"explanation: {result_data.get('explanation', 'N/A')[:100]}"
                 )
-                response.raise_for_status()
 
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
-
-                # Parse JSON response
-                import json
-                result_data = json.loads(content)
-
-                # Only YES passes
-                is_legitimate = result_data.get("result") == "YES"
-
-                print(f"[Perplexity Check] '{company_name}' -> {'PASS' if is_legitimate else 'FAIL'}")
-                print(f"  Result: {result_data.get('result')}")
-                print(f"  Explanation: {result_data.get('explanation', 'N/A')[:100]}...")
-                if result_data.get("closest_company_name"):
-                    print(f"  Matched: {result_data.get('closest_company_name')}")
-
-                return is_legitimate, result_data
+            return is_legitimate, result_data
 
         except Exception as e:
-            print(f"Error in Perplexity check: {e}")
+            logger.error(f"Error in Perplexity check: {e}")
             return False, None
 
     async def verify_employer(
@@ -293,7 +505,7 @@ Follow the JSON structure exactly. Do not include any fields other than these fo
         additional_context: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Verify employer through two sources in parallel
+        Verify employer against the allowlist, then Perplexity if not listed
 
         Args:
             company_name: Company name to verify
@@ -306,29 +518,62 @@ Follow the JSON structure exactly. Do not include any fields other than these fo
                 "passed": bool,  # True if ANY check passed
                 "checks": {
                     "google_sheet": bool,
-                    "perplexity": bool
+                    "perplexity": bool or None  # None if skipped
                 },
-                "passed_by": str  # Source that verified, or "none"
+                "passed_by": str,  # Source that verified, or "none"
+                "reason": str  # Only present for rejected input: "invalid_input"
             }
         """
-        print(f"\n=== Employer Verification: '{company_name}' ===")
-
-        # Run two checks in parallel (DataForThai commented out - unreliable)
-        results = await asyncio.gather(
-            self.check_google_sheet_allowlist(company_name),
-            # self.check_dataforthai_registry(company_name),  # Disabled: unreliable for short names
-            self.check_perplexity_web(company_name, website, additional_context),
-            return_exceptions=True  # Don't fail if one API errors
+        # Repeat verifications of the same employer share one verdict, and
+        # concurrent ones share one in-flight run
+        return await self._verification_cache.get_or_fetch(
+            (_verification_key(company_name), _verification_key(website), _verification_key(additional_context)),
+            lambda: self._verify_employer(company_name, website, additional_context),
+            ttl=_verification_ttl,
         )
 
-        # Extract results (handle exceptions)
-        google_sheet_pass = results[0] if not isinstance(results[0], Exception) else False
-        # dataforthai_pass = results[1] if not isinstance(results[1], Exception) else False
+    async def _verify_employer(
+        self,
+        company_name: str,
+        website: Optional[str],
+        additional_context: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run the verification checks (uncached; see verify_employer)"""
+        # Empty, one-character and placeholder names can't be verified. Checked
+        # before suffixes are stripped, so "X Corp" or "Unknown Co" still count
+        name = _clean_company_text(company_name)
+        if len(name) < 2 or name in _PLACEHOLDER_COMPANY_NAMES:
+            logger.info(f"Employer verification for '{company_name}': FAIL (invalid input)")
+            return {
+                "passed": False,
+                "checks": {
+                    "google_sheet": False,
+                    "perplexity": False
+                },
+                "passed_by": "none",
+                "reason": "invalid_input"
+            }
+
+        # Check the allowlist first (DataForThai registry check disabled:
+        # unreliable for short names). Once loaded it answers in microseconds,
+        # and a pass settles the verdict, so the paid Perplexity search only
+        # runs for companies that aren't on it
+        try:
+            google_sheet_pass = await self.check_google_sheet_allowlist(company_name)
+        except Exception:
+            # Don't fail if one check errors
+            google_sheet_pass = False
 
-        # Perplexity returns tuple (bool, dict)
-        perplexity_result = results[1] if not isinstance(results[1], Exception) else (False, None)
-        perplexity_pass = perplexity_result[0] if isinstance(perplexity_result, tuple) else False
-        perplexity_data = perplexity_result[1] if isinstance(perplexity_result, tuple) else None
+        if google_sheet_pass:
+            perplexity_pass, perplexity_data = None, None
+        else:
+            try:
+                # Perplexity returns tuple (bool, dict)
+                perplexity_pass, perplexity_data = await self.check_perplexity_web(
+                    company_name, website, additional_context
+                )
+            except Exception:
+                perplexity_pass, perplexity_data = False, None
 
         # Determine overall pass (ANY pass = PASS)
         passed = google_sheet_pass or perplexity_pass
@@ -360,6 +605,12 @@ Follow the JSON structure exactly. Do not include any fields other than these fo
                 "closest_company_website": perplexity_data.get("closest_company_website")
             }
 
-        print(f"=== Result: {'PASS' if passed else 'FAIL'} (by {passed_by}) ===\n")
+        logger.info(f"Employer verification for '{company_name}': {'PASS' if passed else 'FAIL'} (by {passed_by})")
 
         return result
+
+
+@lru_cache(maxsize=1)
+def get_employer_verification_service() -> EmployerVerificationService:
+    """Return the shared EmployerVerificationService, so its caches survive across requests"""
+    return EmployerVerificationService()
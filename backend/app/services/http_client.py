@@ -0,0 +1,39 @@
+"""
+Shared outbound HTTP client for the services
+"""
+
+import httpx
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP/2 client
+
+    One connection pool serves every outbound host (OpenAI, Google Maps and
+    Sheets, Perplexity, DataForThai), so TLS connections are kept alive
+    between requests and concurrent requests to the same host are
+    multiplexed over a single HTTP/2 connection.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=50,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared client and its pooled connections
+
+    Called on application shutdown so in-flight keep-alive connections are
+    released cleanly instead of being dropped when the process exits.
+    """
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
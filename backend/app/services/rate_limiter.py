@@ -0,0 +1,46 @@
+"""
+Client-side rate limiting for calls to external APIs
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket that makes callers wait instead of exceeding an API's rate
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens per
+    second. Each request takes one token; when the bucket is empty, callers
+    queue on a lock and sleep until the next token is due, so a burst is
+    smoothed out rather than answered with 429s from the provider.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Take tokens from the bucket, waiting for them if necessary
+
+        Args:
+            tokens: Number of tokens the request costs
+        """
+        # Waiters are served in arrival order: the lock is held while sleeping
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+
+            self._tokens -= tokens
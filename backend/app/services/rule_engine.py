@@ -1,23 +1,82 @@
 from app.schemas.application import ApplicationData, RedFlag
-from app.services.distance_service import DistanceService
-from app.services.blacklist_service import BlacklistService
-from app.services.employer_verification_service import EmployerVerificationService
-from typing import List
+from app.services.distance_service import get_distance_service
+from app.services.blacklist_service import get_blacklist_service
+from app.services.employer_verification_service import get_employer_verification_service
+from functools import lru_cache
+from typing import Awaitable, Callable, List
 import asyncio
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
 
 
 # Source of Funds alignment matrix
-# Maps employment type -> allowed source of funds
-SOURCE_OF_FUNDS_ALIGNMENT = {
-    "Business Owner": ["Inheritance", "Savings", "Investments", "Pension", "Business Income", "Other"],
-    "Government Officer": ["Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"],
-    "Self-Employed": ["Salary", "Inheritance", "Savings", "Investments", "Pension", "Business Income", "Other"],
-    "State Enterprise Officer": ["Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"],
-    "Freelancer": ["Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"],
-    "Student": ["Inheritance", "Savings", "Investments", "Other"],
-    "Company Employee": ["Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"],
-    "Politician": ["Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"],
-    "Unemployed": ["Inheritance", "Savings", "Investments", "Pension", "Other"],
+# Maps employment type -> allowed source of funds, in display order
+SOURCE_OF_FUNDS_ALLOWED_ORDERED: dict[str, tuple[str, ...]] = {
+    "Business Owner": ("Inheritance", "Savings", "Investments", "Pension", "Business Income", "Other"),
+    "Government Officer": ("Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"),
+    "Self-Employed": ("Salary", "Inheritance", "Savings", "Investments", "Pension", "Business Income", "Other"),
+    "State Enterprise Officer": ("Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"),
+    "Freelancer": ("Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"),
+    "Student": ("Inheritance", "Savings", "Investments", "Other"),
+    "Company Employee": ("Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"),
+    "Politician": ("Salary", "Inheritance", "Savings", "Investments", "Pension", "Other"),
+    "Unemployed": ("Inheritance", "Savings", "Investments", "Pension", "Other"),
+}
+
+# Same matrix as frozensets, so the rule's membership test is a hash probe
+SOURCE_OF_FUNDS_ALIGNMENT: dict[str, frozenset[str]] = {
+    employment_type: frozenset(sources)
+    for employment_type, sources in SOURCE_OF_FUNDS_ALLOWED_ORDERED.items()
+}
+
+
+# Affected fields per rule, shared by every red flag the rule raises. Lists
+# (not tuples) to match RedFlag.affectedFields, since model_construct skips
+# the validation that would otherwise convert them; never mutated
+_DISTANCE_FIELDS = ["currentAddress", "companyAddress"]
+_BLACKLIST_FIELDS = ["firstName", "lastName"]
+_POLITICAL_EXPOSURE_FIELDS = ["preScreening"]
+_EMPLOYER_FIELDS = ["companyName", "companyWebsite"]
+_SOURCE_OF_FUNDS_FIELDS = ["employmentType", "sourceOfFunds"]
+
+# Longest each I/O rule may take, in seconds, so a stalled upstream can't
+# stall the whole validation. Each budget is above the timeouts of the
+# requests the rule makes (10s for the sheets and geocoder; the employer
+# check may load the allowlist and then wait on Perplexity's 15s), so a slow
+# but healthy upstream still answers. Cached lookups and the sheets' first
+# load are shielded, so a timed-out lookup still finishes in the background
+# and serves the next request.
+_RULE_TIMEOUTS = {
+    "blacklist_check": 12.0,
+    "distance_check": 12.0,
+    "employer_verification_check": 30.0,
+}
+
+# debugInfo "reason" of the red flag raised for a rule that ran out of time.
+# The flag keeps the rule's name (so the form marks the right check), and the
+# chat prompt treats it neutrally rather than as that rule's finding
+RULE_TIMEOUT_REASON = "timeout"
+
+
+def _misaligned_source_flag(employment_type: str, source_of_funds: str) -> RedFlag:
+    """Red flag for a source of funds not allowed for a (known) employment type"""
+    return RedFlag.model_construct(
+        rule="source_of_funds_alignment_check",
+        message=f"The source of funds '{source_of_funds}' doesn't typically align with employment type '{employment_type}'. Can you provide more details?",
+        affectedFields=_SOURCE_OF_FUNDS_FIELDS,
+        debugInfo={"employmentType": employment_type, "sourceOfFunds": source_of_funds, "allowedSources": SOURCE_OF_FUNDS_ALLOWED_ORDERED[employment_type]}
+    )
+
+
+# Precomputed outcome for every (employment type, source of funds) pair in the
+# matrix: None when aligned, else a shared prebuilt red flag (never mutated)
+_KNOWN_SOURCES = frozenset().union(*SOURCE_OF_FUNDS_ALIGNMENT.values())
+_SOURCE_OF_FUNDS_DECISIONS: dict[tuple[str, str], RedFlag | None] = {
+    (employment_type, source): None if source in allowed else _misaligned_source_flag(employment_type, source)
+    for employment_type, allowed in SOURCE_OF_FUNDS_ALIGNMENT.items()
+    for source in _KNOWN_SOURCES
 }
 
 
@@ -25,9 +84,34 @@ class RuleEngine:
     """Rule engine to validate application data"""
 
     def __init__(self):
-        self.distance_service = DistanceService()
-        self.blacklist_service = BlacklistService()
-        self.employer_verification_service = EmployerVerificationService()
+        self.distance_service = get_distance_service()
+        self.blacklist_service = get_blacklist_service()
+        self.employer_verification_service = get_employer_verification_service()
+
+        # Rules that call external services, run concurrently by validate():
+        # (rule name, guard, check, fields flagged if the check times out).
+        # The guard mirrors the check's own skip condition, so a rule with
+        # nothing to check isn't scheduled as a task at all
+        self._io_rules = [
+            (
+                "blacklist_check",
+                lambda data: bool(data.firstName and data.lastName),
+                self.check_blacklist_rule,
+                _BLACKLIST_FIELDS,
+            ),
+            (
+                "employer_verification_check",
+                lambda data: bool(data.companyName and data.companyName.strip()),
+                self.check_employer_verification_rule,
+                _EMPLOYER_FIELDS,
+            ),
+            (
+                "distance_check",
+                lambda data: bool(data.currentAddress and data.companyAddress),
+                self.check_distance_rule,
+                _DISTANCE_FIELDS,
+            ),
+        ]
 
     async def check_distance_rule(self, data: ApplicationData) -> RedFlag | None:
         """
@@ -46,14 +130,18 @@ class RuleEngine:
         if not current_addr or not company_addr:
             return None
 
-        # Geocode addresses and calculate distance (returns coords and Google status)
-        current_coords, current_status = await self.distance_service.geocode_address(current_addr)
-        company_coords, company_status = await self.distance_service.geocode_address(company_addr)
+        # Geocode both addresses concurrently (returns coords and Google status).
+        # The raw addresses are passed as-is and kept for debugInfo: the
+        # geocode cache already keys on the case/whitespace-normalized form
+        # (distance_service._address_key), so noisy input still hits it
+        (current_coords, current_status), (company_coords, company_status) = (
+            await self.distance_service.geocode_many([current_addr, company_addr])
+        )
 
-        # Calculate distance (returns distance and statuses, but we already have statuses from above)
-        is_within_limit, distance, _, _ = await self.distance_service.check_distance_within_limit(
-            current_addr,
-            company_addr,
+        # Calculate distance from the coordinates above rather than geocoding again
+        is_within_limit, distance = self.distance_service.check_distance_within_limit_coords(
+            current_coords,
+            company_coords,
             limit_km=150.0
         )
 
@@ -76,19 +164,19 @@ class RuleEngine:
 
         # If we couldn't calculate distance (geocoding failed)
         if distance is None:
-            return RedFlag(
+            return RedFlag.model_construct(
                 rule="distance_check",
                 message="Could not verify addresses. Please ensure both addresses are valid.",
-                affectedFields=["currentAddress", "companyAddress"],
+                affectedFields=_DISTANCE_FIELDS,
                 debugInfo=debug_info
             )
 
         # If distance exceeds limit
         if not is_within_limit:
-            return RedFlag(
+            return RedFlag.model_construct(
                 rule="distance_check",
                 message=f"Home and work addresses are {distance:.1f}km apart (limit: 150km)",
-                affectedFields=["currentAddress", "companyAddress"],
+                affectedFields=_DISTANCE_FIELDS,
                 debugInfo=debug_info
             )
 
@@ -119,16 +207,16 @@ class RuleEngine:
         )
 
         if is_blacklisted:
-            return RedFlag(
+            return RedFlag.model_construct(
                 rule="blacklist_check",
                 message=f"Name '{first_name} {last_name}' appears in restricted list",
-                affectedFields=["firstName", "lastName"]
+                affectedFields=_BLACKLIST_FIELDS
             )
 
         # Name not blacklisted - pass
         return None
 
-    async def check_political_exposure_rule(self, data: ApplicationData) -> RedFlag | None:
+    def check_political_exposure_rule(self, data: ApplicationData) -> RedFlag | None:
         """
         Check if applicant has political exposure requiring review
 
@@ -142,21 +230,26 @@ class RuleEngine:
         pre_screening = data.preScreening
 
         # Skip if not answered or answered "no"
-        if not pre_screening or pre_screening.response != 'yes':
+        if not pre_screening:
+            return None
+        response = pre_screening.response
+        if response != 'yes':
             return None
 
         # If answered "yes", always flag for manual review
         # (even if explanation provided - compliance requirement)
-        explanation_preview = pre_screening.explanation[:100] if pre_screening.explanation else ""
+        explanation = pre_screening.explanation
+        chat_history = pre_screening.chatHistory
+        explanation_preview = explanation[:100] if explanation else ""
 
-        return RedFlag(
+        return RedFlag.model_construct(
             rule="political_exposure_check",
             message=f"Applicant indicated political exposure: {explanation_preview}...",
-            affectedFields=["preScreening"],
+            affectedFields=_POLITICAL_EXPOSURE_FIELDS,
             debugInfo={
-                "response": pre_screening.response,
-                "explanation": pre_screening.explanation,
-                "chatMessageCount": len(pre_screening.chatHistory) if pre_screening.chatHistory else 0
+                "response": response,
+                "explanation": explanation,
+                "chatMessageCount": len(chat_history) if chat_history else 0
             }
         )
 
@@ -184,17 +277,17 @@ class RuleEngine:
         )
 
         if not result["passed"]:
-            return RedFlag(
+            return RedFlag.model_construct(
                 rule="employer_verification_check",
                 message=f"Could not verify employer '{company_name}'",
-                affectedFields=["companyName", "companyWebsite"],
+                affectedFields=_EMPLOYER_FIELDS,
                 debugInfo=result
             )
 
         # Verification passed
         return None
 
-    async def check_source_of_funds_alignment_rule(self, data: ApplicationData) -> RedFlag | None:
+    def check_source_of_funds_alignment_rule(self, data: ApplicationData) -> RedFlag | None:
         """
         Check if source of funds aligns with employment type
 
@@ -213,52 +306,104 @@ class RuleEngine:
         if not source_of_funds or not source_of_funds.strip():
             return None
 
-        # Normalize
-        employment_type = employment_type.strip()
-        source_of_funds = source_of_funds.strip()
-
-        # Check employment type exists in matrix
-        if employment_type not in SOURCE_OF_FUNDS_ALIGNMENT:
-            return RedFlag(
-                rule="source_of_funds_alignment_check",
-                message=f"Unable to validate source of funds alignment for employment type '{employment_type}'",
-                affectedFields=["employmentType", "sourceOfFunds"],
-                debugInfo={"employmentType": employment_type, "sourceOfFunds": source_of_funds, "reason": "unknown_employment_type"}
-            )
+        key = (employment_type.strip(), source_of_funds.strip())
 
-        allowed_sources = SOURCE_OF_FUNDS_ALIGNMENT[employment_type]
+        # Every pairing of a known employment type with a source in the
+        # matrix is decided ahead of time; anything else is built here
+        try:
+            return _SOURCE_OF_FUNDS_DECISIONS[key]
+        except KeyError:
+            pass
 
-        # Check if source of funds is in allowed list
-        if source_of_funds not in allowed_sources:
-            return RedFlag(
+        # Check employment type exists in matrix
+        if key[0] not in SOURCE_OF_FUNDS_ALIGNMENT:
+            return RedFlag.model_construct(
                 rule="source_of_funds_alignment_check",
-                message=f"The source of funds '{source_of_funds}' doesn't typically align with employment type '{employment_type}'. Can you provide more details?",
-                affectedFields=["employmentType", "sourceOfFunds"],
-                debugInfo={"employmentType": employment_type, "sourceOfFunds": source_of_funds, "allowedSources": allowed_sources}
+                message=f"Unable to validate source of funds alignment for employment type '{key[0]}'",
+                affectedFields=_SOURCE_OF_FUNDS_FIELDS,
+                debugInfo={"employmentType": key[0], "sourceOfFunds": key[1], "reason": "unknown_employment_type"}
             )
 
-        return None
+        # Known employment type, but a source the matrix never allows
+        return _misaligned_source_flag(*key)
 
-    async def validate(self, data: ApplicationData) -> List[RedFlag]:
+    async def validate(self, data: ApplicationData, fail_fast: bool = False) -> List[RedFlag]:
         """
         Run all validation rules on application data in parallel
 
         Args:
             data: Application data to validate
+            fail_fast: Return as soon as the in-memory rules raise a red flag,
+                without running the rules that call external services
 
         Returns:
             List of red flags (empty if all rules pass)
         """
-        # Run all validation rules in parallel for better performance
-        results = await asyncio.gather(
-            self.check_blacklist_rule(data),
-            self.check_employer_verification_rule(data),
-            self.check_distance_rule(data),
+        # In-memory rules first, called inline (no I/O, so no coroutine to
+        # schedule); with fail_fast their red flags are enough to skip the
+        # blacklist, Perplexity and geocoder
+        cheap_results = [
             self.check_political_exposure_rule(data),
             self.check_source_of_funds_alignment_rule(data),
-        )
-
-        # Filter out None values (passed validations)
-        red_flags = [flag for flag in results if flag is not None]
+        ]
+        if fail_fast and any(cheap_results):
+            return [flag for flag in cheap_results if flag is not None]
+
+        # Run the I/O rules in parallel for better performance
+        # (latency is the slowest rule rather than the sum of all of them)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(self._run_rule(rule_name, check, affected_fields, data))
+                for rule_name, applies, check, affected_fields in self._io_rules
+                if applies(data)
+            ]
+        results = [task.result() for task in tasks]
+
+        # Keep only red flags (drop passed validations and failed rules)
+        red_flags = [flag for flag in [*results, *cheap_results] if flag is not None]
 
         return red_flags
+
+    async def _run_rule(
+        self,
+        rule_name: str,
+        check: Callable[[ApplicationData], Awaitable[RedFlag | None]],
+        affected_fields: List[str],
+        data: ApplicationData
+    ) -> RedFlag | None:
+        """
+        Run one I/O rule within its time limit, logging (not raising) failures
+
+        A failing rule must not discard the results of the others, which it
+        would by raising inside validate()'s task group. A rule that runs out
+        of time is flagged rather than passed, since it couldn't verify.
+
+        Args:
+            rule_name: Rule name, used for the time limit and timeout red flag
+            check: Rule to run
+            affected_fields: Fields to flag if the rule times out
+            data: Application data
+
+        Returns:
+            The rule's RedFlag, a timeout RedFlag, or None if it passed or failed
+        """
+        timeout = _RULE_TIMEOUTS[rule_name]
+        try:
+            return await asyncio.wait_for(check(data), timeout=timeout)
+        except TimeoutError:
+            logger.warning(f"Validation rule {rule_name} timed out after {timeout}s")
+            return RedFlag.model_construct(
+                rule=rule_name,
+                message="This check could not be completed in time. Please confirm these details are correct.",
+                affectedFields=affected_fields,
+                debugInfo={"reason": RULE_TIMEOUT_REASON, "timeout_s": timeout}
+            )
+        except Exception:
+            logger.error(f"Validation rule {rule_name} failed", exc_info=True)
+            return None
+
+
+@lru_cache(maxsize=1)
+def get_rule_engine() -> RuleEngine:
+    """Return the shared RuleEngine instance, so it isn't rebuilt per validation"""
+    return RuleEngine()
@@ -5,7 +5,7 @@ Provides abstract base class for tool handlers and a registry for managing tools
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
 
 class ToolHandler(ABC):
@@ -40,6 +40,22 @@ class ToolHandler(ABC):
         """
         pass
 
+    def direct_reply(self, arguments: Dict[str, Any], result: str) -> Optional[str]:
+        """
+        Return a canned assistant reply for a deterministic result, if any
+
+        When every tool call in a turn has a direct reply, the chat service
+        answers with it instead of asking the model to phrase the outcome.
+
+        Args:
+            arguments: Parsed tool arguments from OpenAI
+            result: Result string returned by execute()
+
+        Returns:
+            Reply text, or None to let the model respond
+        """
+        return None
+
 
 class ToolRegistry:
     """Registry for managing available tools"""
@@ -47,36 +63,49 @@ class ToolRegistry:
     def __init__(self):
         self._tools: Dict[str, ToolHandler] = {}
 
+        # Schemas are static, so the lists are built once and rebuilt only
+        # when a tool is registered
+        self._all_schemas: List[Dict[str, Any]] = []
+        self._schema_subsets: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+
     def register(self, tool: ToolHandler) -> None:
         """Register a tool handler"""
         self._tools[tool.name] = tool
+        self._all_schemas = [self._wrap_schema(t) for t in self._tools.values()]
+        self._schema_subsets.clear()
+
+    @staticmethod
+    def _wrap_schema(tool: ToolHandler) -> Dict[str, Any]:
+        """Wrap a tool's function schema in OpenAI's tool format"""
+        return {
+            "type": "function",
+            "function": tool.get_schema()
+        }
 
     def get_tool(self, name: str) -> Optional[ToolHandler]:
         """Get tool handler by name"""
         return self._tools.get(name)
 
-    def get_schemas(self, tool_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def get_schemas(self, tool_names: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         Get OpenAI schemas for specified tools (or all if None)
 
         Args:
-            tool_names: List of tool names to include, or None for all
+            tool_names: Names of the tools to include, or None for all
 
         Returns:
-            List of OpenAI function schemas
+            List of OpenAI function schemas (shared; do not mutate)
         """
         if tool_names is None:
-            tools = self._tools.values()
-        else:
-            tools = [self._tools[name] for name in tool_names if name in self._tools]
-
-        return [
-            {
-                "type": "function",
-                "function": tool.get_schema()
-            }
-            for tool in tools
-        ]
+            return self._all_schemas
+
+        key = tuple(tool_names)
+        schemas = self._schema_subsets.get(key)
+        if schemas is None:
+            schemas = [self._wrap_schema(self._tools[name]) for name in key if name in self._tools]
+            self._schema_subsets[key] = schemas
+
+        return schemas
 
     async def execute(
         self,
@@ -90,3 +119,16 @@ class ToolRegistry:
             raise ValueError(f"Unknown tool: {tool_name}")
 
         return await tool.execute(arguments, context)
+
+    def direct_reply(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        result: str
+    ) -> Optional[str]:
+        """Get a tool's direct reply for a result (None if it has none)"""
+        tool = self.get_tool(tool_name)
+        if not tool:
+            return None
+
+        return tool.direct_reply(arguments, result)
@@ -4,48 +4,65 @@ Employer Verification Tool Handler
 Provides tool for verifying employer legitimacy through multiple sources.
 """
 
-from typing import Dict, Any, Optional
+from typing import ClassVar, Dict, Any, Optional
 from app.services.tools.base import ToolHandler
-from app.services.employer_verification_service import EmployerVerificationService
+from app.services.employer_verification_service import get_employer_verification_service
+
+# Fixed opening lines of the formatted result
+_PASSED_HEADER = "✅ VERIFICATION PASSED\n\n**Verification Sources:**"
+_FAILED_HEADER = "❌ VERIFICATION FAILED\n\nThe company could not be verified through:"
+
+# Result line for a pass from the internal allowlist. The prompt scripts the
+# reply for this outcome, so it is answered directly (see direct_reply)
+_ALLOWLIST_PASSED = "- Google Sheets Allowlist: ✅ PASSED"
+_ALLOWLIST_PASS_REPLY = (
+    "Great news! {company_name} was verified through our pre-approved company list, "
+    "so this issue is now resolved. Thank you for confirming your employer details!"
+)
 
 
 class EmployerVerificationToolHandler(ToolHandler):
     """Tool for verifying employer legitimacy"""
 
+    _NAME: ClassVar[str] = "verify_employer"
+
+    # Static, so built once; get_schema returns this shared dict
+    _SCHEMA: ClassVar[Dict[str, Any]] = {
+        "name": _NAME,
+        "description": "Verify if a company/employer is legitimate by checking multiple sources (Google Sheets allowlist, Perplexity AI web search). Use this when you need to check if a company name is real or when the user provides a corrected company name.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "company_name": {
+                    "type": "string",
+                    "description": "The company name to verify (e.g., 'SCB Bank', 'Google', 'บริษัท อัลฟ่า ยูนิเทรด จำกัด')"
+                },
+                "company_website": {
+                    "type": "string",
+                    "description": "Optional company website URL for additional verification context",
+                    "nullable": True
+                },
+                "additional_context": {
+                    "type": "string",
+                    "description": "Optional additional context provided by the user (e.g., company address, industry, what they do, registration details). Include any relevant information that might help verify the company.",
+                    "nullable": True
+                }
+            },
+            "required": ["company_name"],
+            "additionalProperties": False
+        }
+    }
+
     def __init__(self):
-        self.verification_service = EmployerVerificationService()
+        self.verification_service = get_employer_verification_service()
 
     @property
     def name(self) -> str:
-        return "verify_employer"
+        return self._NAME
 
     def get_schema(self) -> Dict[str, Any]:
         """Return OpenAI function schema"""
-        return {
-            "name": self.name,
-            "description": "Verify if a company/employer is legitimate by checking multiple sources (Google Sheets allowlist, Perplexity AI web search). Use this when you need to check if a company name is real or when the user provides a corrected company name.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "company_name": {
-                        "type": "string",
-                        "description": "The company name to verify (e.g., 'SCB Bank', 'Google', 'บริษัท อัลฟ่า ยูนิเทรด จำกัด')"
-                    },
-                    "company_website": {
-                        "type": "string",
-                        "description": "Optional company website URL for additional verification context",
-                        "nullable": True
-                    },
-                    "additional_context": {
-                        "type": "string",
-                        "description": "Optional additional context provided by the user (e.g., company address, industry, what they do, registration details). Include any relevant information that might help verify the company.",
-                        "nullable": True
-                    }
-                },
-                "required": ["company_name"],
-                "additionalProperties": False
-            }
-        }
+        return self._SCHEMA
 
     async def execute(
         self,
@@ -67,38 +84,51 @@ class EmployerVerificationToolHandler(ToolHandler):
         # Format result
         return self._format_result(result)
 
+    def direct_reply(self, arguments: Dict[str, Any], result: str) -> Optional[str]:
+        """Answer allowlist passes directly; other outcomes need the model"""
+        if result.startswith(_PASSED_HEADER) and _ALLOWLIST_PASSED in result:
+            return _ALLOWLIST_PASS_REPLY.format(company_name=arguments["company_name"])
+
+        return None
+
     def _format_result(self, result: Dict[str, Any]) -> str:
         """Format verification result for chatbot consumption"""
         passed = result.get("passed", False)
-        passed_by = result.get("passed_by", "none")
         checks = result.get("checks", {})
         perplexity_details = result.get("perplexity_details", {})
 
+        # Collect lines and join once, rather than re-copying the message per +=
         if passed:
-            message = "✅ VERIFICATION PASSED\n\n"
+            parts = [_PASSED_HEADER]
 
             # Show which sources were checked and which one passed
-            message += "**Verification Sources:**\n"
-            message += f"- Google Sheets Allowlist: {'✅ PASSED' if checks.get('google_sheet') else '❌ Failed'}\n"
-            message += f"- Perplexity Web Search: {'✅ PASSED' if checks.get('perplexity') else '❌ Failed'}\n\n"
+            parts.append(_ALLOWLIST_PASSED if checks.get('google_sheet') else "- Google Sheets Allowlist: ❌ Failed")
+            if checks.get('perplexity') is None:
+                # Not run: the allowlist already verified the company
+                parts.append("- Perplexity Web Search: ⏭️ Skipped")
+            else:
+                parts.append(f"- Perplexity Web Search: {'✅ PASSED' if checks.get('perplexity') else '❌ Failed'}")
+            parts.append("")
 
             # If Perplexity passed, show its details
             if checks.get('perplexity') and perplexity_details:
-                message += "**Perplexity AI Verification Details:**\n"
-                message += f"- Result: {perplexity_details.get('result', 'N/A')}\n"
-                message += f"- Explanation: {perplexity_details.get('explanation', 'N/A')}\n"
+                parts.append("**Perplexity AI Verification Details:**")
+                parts.append(f"- Result: {perplexity_details.get('result', 'N/A')}")
+                parts.append(f"- Explanation: {perplexity_details.get('explanation', 'N/A')}")
                 if perplexity_details.get('closest_company_name'):
-                    message += f"- Official Name: {perplexity_details.get('closest_company_name')}\n"
+                    parts.append(f"- Official Name: {perplexity_details.get('closest_company_name')}")
                 if perplexity_details.get('closest_company_website'):
-                    message += f"- Website: {perplexity_details.get('closest_company_website')}\n"
+                    parts.append(f"- Website: {perplexity_details.get('closest_company_website')}")
         else:
-            message = "❌ VERIFICATION FAILED\n\n"
-            message += "The company could not be verified through:\n"
-            message += f"- Google Sheets Allowlist: {'✓ Pass' if checks.get('google_sheet') else '✗ Fail'}\n"
-            message += f"- Perplexity Web Search: {'✓ Pass' if checks.get('perplexity') else '✗ Fail'}\n\n"
+            parts = [_FAILED_HEADER]
+            parts.append(f"- Google Sheets Allowlist: {'✓ Pass' if checks.get('google_sheet') else '✗ Fail'}")
+            parts.append(f"- Perplexity Web Search: {'✓ Pass' if checks.get('perplexity') else '✗ Fail'}")
+            parts.append("")
 
             if perplexity_details:
-                message += "**Perplexity AI Response:**\n"
-                message += f"{perplexity_details.get('explanation', 'No explanation available')}\n"
+                parts.append("**Perplexity AI Response:**")
+                parts.append(f"{perplexity_details.get('explanation', 'No explanation available')}")
 
-        return message
+        # Every line ends with a newline
+        parts.append("")
+        return "\n".join(parts)